@@ -0,0 +1,137 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+import numpy as np
+
+from Circuit import Circuit
+from ExampleCircuit import build_example_circuit
+from Jacobian import Jacobian
+from SystemSettings import SystemSettings
+
+
+class BatchPowerFlow:
+
+    def __init__(self, circuit: Circuit):
+        self.circuit = circuit
+        self.bus_index = circuit.freeze_topology()
+        self.jacobian = Jacobian(self)  # always called with explicit voltages and angles
+        self.solve_stats = {}
+
+    @property
+    def pv_pq_idx(self):
+        return self.circuit.pv_pq_idx
+
+    @property
+    def pq_idx(self):
+        return self.circuit.pq_idx
+
+    def calc_mismatches(self, voltages, angles, p_specified, q_specified):
+        # [ΔP of the non-slack buses, ΔQ of the PQ buses] of every scenario row, one sparse matrix-matrix product
+        V = voltages * np.exp(1j * angles)
+        S = V * np.conj((self.circuit.ybus_sparse.matrix @ V.T).T)
+        return np.hstack((p_specified[:, self.pv_pq_idx] - S.real[:, self.pv_pq_idx],
+                          q_specified[:, self.pq_idx] - S.imag[:, self.pq_idx]))
+
+    def factorize(self, voltages, angles):
+        # every Jacobian has the Ybus pattern, so the circuit's SparseLU keeps one ordering for all of them
+        return self.circuit.jacobian_lu.factorize(self.jacobian.calc_jacobian(voltages, angles))
+
+    def solve(self, p_injections=None, q_injections=None, tolerance=0.001, max_iterations=50, shared_jacobian=True,
+              refresh_ratio=0.5, init=None):
+        # Newton-Raphson for many injection scenarios of the same circuit at once
+        # p_injections and q_injections in MW and Mvar, (scenarios x buses) ordered by bus index,
+        # the circuit's specified injections for whichever is None
+        # init is a (voltages, angles) pair, per bus or per scenario and bus; flat start if None
+        # shared_jacobian: one Jacobian at the mean state of the active scenarios serves them all, a scenario whose
+        # mismatch does not drop below refresh_ratio of the previous one switches to its own Jacobian
+        # converged scenarios leave the active set
+
+        p_base, q_base = self.circuit.power_specified
+        p_injections = p_base * SystemSettings.Sbase if p_injections is None else p_injections
+        q_injections = q_base * SystemSettings.Sbase if q_injections is None else q_injections
+        p_specified = np.atleast_2d(np.asarray(p_injections, dtype=float)) / SystemSettings.Sbase
+        q_specified = np.atleast_2d(np.asarray(q_injections, dtype=float)) / SystemSettings.Sbase
+        p_specified, q_specified = np.broadcast_arrays(p_specified, q_specified)
+        n_scenarios, N = p_specified.shape
+        if N != len(self.circuit.buses):
+            raise ValueError("Injections need one column per bus.")
+
+        if init is None:
+            init = (np.array([bus.vpu for bus in self.circuit.buses.values()], dtype=float),
+                    np.array([bus.delta for bus in self.circuit.buses.values()], dtype=float))
+        voltages = np.array(np.broadcast_to(np.asarray(init[0], dtype=float), (n_scenarios, N)))
+        angles = np.array(np.broadcast_to(np.asarray(init[1], dtype=float), (n_scenarios, N)))
+
+        pv_pq, pq = self.pv_pq_idx, self.pq_idx
+        npv_pq = len(pv_pq)
+
+        converged = np.zeros(n_scenarios, dtype=bool)
+        iterations = np.full(n_scenarios, max_iterations, dtype=np.int64)
+        own_jacobian = np.zeros(n_scenarios, dtype=bool) if shared_jacobian else np.ones(n_scenarios, dtype=bool)
+        last_norm = np.full(n_scenarios, np.inf)
+        factorizations = 0
+
+        active = np.arange(n_scenarios)
+        for i in range(max_iterations + 1):
+            mismatches = self.calc_mismatches(voltages[active], angles[active], p_specified[active], q_specified[active])
+            norm = np.abs(mismatches).max(axis=1)
+
+            done = norm < tolerance
+            converged[active[done]] = True
+            iterations[active[done]] = i
+            keep = ~done & np.isfinite(norm)  # a scenario that blew up stays unconverged
+            active, mismatches, norm = active[keep], mismatches[keep], norm[keep]
+            if len(active) == 0 or i == max_iterations:
+                break
+
+            # shared steps that stalled get their own Jacobian from now on
+            own_jacobian[active[norm > refresh_ratio * last_norm[active]]] = True
+            last_norm[active] = norm
+
+            delta_x = np.zeros_like(mismatches)
+            failed = np.zeros(len(active), dtype=bool)
+            shared = ~own_jacobian[active]
+            if shared.any():
+                rows = active[shared]
+                try:
+                    factor = self.factorize(voltages[rows].mean(axis=0), angles[rows].mean(axis=0))
+                    factorizations += 1
+                    delta_x[shared] = factor.solve(mismatches[shared].T).T
+                except (np.linalg.LinAlgError, RuntimeError):
+                    # singular at the mean state, each of these scenarios goes on with its own Jacobian
+                    own_jacobian[rows] = True
+                    shared[:] = False
+            for j in np.flatnonzero(~shared):
+                s = active[j]
+                try:
+                    delta_x[j] = self.factorize(voltages[s], angles[s]).solve(mismatches[j])
+                    factorizations += 1
+                except (np.linalg.LinAlgError, RuntimeError):
+                    failed[j] = True  # singular Jacobian, the scenario stays unconverged
+
+            active, delta_x = active[~failed], delta_x[~failed]
+            angles[np.ix_(active, pv_pq)] += delta_x[:, :npv_pq]
+            voltages[np.ix_(active, pq)] += delta_x[:, npv_pq:]
+
+        self.solve_stats = {"method": "batch-nr", "scenarios": n_scenarios, "converged": int(converged.sum()),
+                            "iterations": int(iterations.max(initial=0)), "factorizations": factorizations}
+
+        return {"voltages": voltages, "angles": angles, "converged": converged, "iterations": iterations}
+
+
+if __name__ == "__main__":
+    circuit1 = build_example_circuit()
+
+    # every load scaled from 80 % to 120 %
+    p_base, q_base = circuit1.power_specified
+    scale = np.linspace(0.8, 1.2, 9)[:, np.newaxis]
+    load_p = np.minimum(p_base, 0) * SystemSettings.Sbase
+    p_injections = p_base * SystemSettings.Sbase - load_p + scale * load_p
+    q_injections = scale * q_base * SystemSettings.Sbase
+
+    batch = BatchPowerFlow(circuit1)
+    results = batch.solve(p_injections, q_injections)
+    for k, s in enumerate(scale[:, 0]):
+        print(f"Load x {s:.2f}: Vmin = {results['voltages'][k].min():.4f} p.u., iterations = {results['iterations'][k]}")
+    print(batch.solve_stats)
@@ -3,15 +3,18 @@
 # Maria Hermann
 
 class Bus:
-    # Class variable to keep track of the number of Bus instances
-    instance_count = 0
+    # integer bus type codes used by the numeric kernels
+    SLACK = 0
+    PV = 1
+    PQ = 2
+    type_codes = {"Slack Bus": SLACK, "PV Bus": PV, "PQ Bus": PQ}
 
-    def __init__(self, name: str, base_kv: float):
+    def __init__(self, name: str, base_kv: float, index: int = None):
         self.name = name
         self.base_kv = base_kv
         self.vpu = 1
         self.delta = 0
         self.bus_type = "PQ Bus"
 
-        Bus.instance_count += 1
-        self.index = Bus.instance_count
\ No newline at end of file
+        # position of the bus in its circuit, assigned by Circuit.add_bus
+        self.index = index
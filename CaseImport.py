@@ -0,0 +1,430 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+import os
+import re
+import warnings
+import numpy as np
+
+from Circuit import Circuit
+from SystemSettings import SystemSettings
+
+# MATPOWER column positions (0-based)
+BUS_I, BUS_TYPE, PD, QD, GS, BS, VM, VA, BASE_KV = 0, 1, 2, 3, 4, 5, 7, 8, 9
+GEN_BUS, PG, QG, VG, GEN_STATUS = 0, 1, 2, 5, 7
+F_BUS, T_BUS, BR_R, BR_X, BR_B, RATE_A, TAP, SHIFT, BR_STATUS = 0, 1, 2, 3, 4, 5, 8, 9, 10
+
+# PSS/E RAW data sections in file order, each one ends with a "0" record
+psse_sections = {
+    33: ["bus", "load", "fixed_shunt", "generator", "branch", "transformer", "area", "two_terminal_dc", "vsc_dc",
+         "impedance_correction", "multi_terminal_dc", "multi_section_line", "zone", "interarea", "owner", "facts",
+         "switched_shunt"],
+    34: ["bus", "load", "fixed_shunt", "generator", "branch", "switching_device", "transformer", "area", "two_terminal_dc",
+         "vsc_dc", "impedance_correction", "multi_terminal_dc", "multi_section_line", "zone", "interarea", "owner", "facts",
+         "switched_shunt"],
+}
+
+_comma = re.compile(r",(?=(?:[^']*'[^']*')*[^']*$)")  # commas outside quotes
+_token = re.compile(r"'[^']*'|\S+")
+_vector_group = re.compile(r"(YN|Y|D)(YN|Y|D)\d*")  # PSS/E winding connection code, e.g. YNd1
+
+
+def new_case(name, base_mva):
+    # importer-neutral column lists, impedances in per unit on the case base, powers in MW and Mvar
+    return {
+        "name": name,
+        "base_mva": base_mva,
+        "buses": {"name": [], "base_kv": [], "type": [], "vm": [], "va": []},  # type 1 PQ, 2 PV, 3 reference, 4 isolated
+        "lines": {"name": [], "bus1": [], "bus2": [], "r": [], "x": [], "b": [], "rating": [], "status": []},
+        "transformers": {"name": [], "bus1": [], "bus2": [], "r": [], "x": [], "rating": [], "tap": [], "shift": [],
+                         "b": [], "status": [], "connection": [], "grounding": []},
+        "generators": {"name": [], "bus": [], "p": [], "q": [], "vg": [], "status": []},
+        "loads": {"name": [], "bus": [], "p": [], "q": []},
+        "shunts": {"name": [], "bus": [], "g": [], "b": []},
+    }
+
+
+def append(columns, **values):
+    for field, value in values.items():
+        columns[field].append(value)
+
+
+def read_case(path: str, name: str = None):
+    # circuit from a MATPOWER (.m, .mat) or PSS/E RAW (.raw) case file
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".m":
+        return read_matpower(path, name)
+    if extension == ".mat":
+        return read_matpower_mat(path, name)
+    if extension == ".raw":
+        return read_psse_raw(path, name)
+    raise ValueError(f"Unknown case file type: {extension}")
+
+
+def read_matpower(path: str, name: str = None):
+    # MATPOWER .m case, read line by line; only baseMVA and the bus, gen and branch matrices are used
+    base_mva = 100.0
+    matrices = {"bus": [], "gen": [], "branch": []}
+    current = None  # matrix being read, "" for one that is skipped (gencost, bus_name, ...)
+
+    with open(path) as file:
+        for line in file:
+            line = line.split("%", 1)[0].strip()
+            if not line:
+                continue
+
+            if current is None:
+                match = re.match(r"mpc\.(\w+)\s*=\s*(.*)$", line)
+                if match is None:
+                    continue
+                field, line = match.groups()
+                if field == "baseMVA":
+                    base_mva = float(line.rstrip(";").strip())
+                    continue
+                if not line.startswith(("[", "{")):
+                    continue
+                current = field if field in matrices else ""
+                line = line[1:]
+
+            end = re.search(r"[\]}]", line)
+            if end is not None:
+                line = line[:end.start()]
+            if current:
+                for row in line.split(";"):
+                    values = row.replace(",", " ").split()
+                    if values:
+                        matrices[current].append([float(value) for value in values])
+            if end is not None:
+                current = None
+
+    return build_circuit(matpower_case(name or os.path.splitext(os.path.basename(path))[0], base_mva,
+                                       *(np.array(matrices[key], dtype=float).reshape(len(matrices[key]), -1)
+                                         for key in ("bus", "gen", "branch"))))
+
+
+def read_matpower_mat(path: str, name: str = None):
+    # MATPOWER case saved with savecase(..., 'mpc') or as separate baseMVA, bus, gen and branch variables
+    from scipy.io import loadmat
+
+    data = loadmat(path, squeeze_me=True, struct_as_record=False)
+    mpc = data["mpc"] if "mpc" in data else None
+
+    def field(key):
+        return getattr(mpc, key) if mpc is not None else data[key]
+
+    bus, gen, branch = (np.atleast_2d(np.asarray(field(key), dtype=float)) for key in ("bus", "gen", "branch"))
+    return build_circuit(matpower_case(name or os.path.splitext(os.path.basename(path))[0], float(field("baseMVA")),
+                                       bus, gen, branch))
+
+
+def matpower_case(name, base_mva, bus, gen, branch):
+    # MATPOWER matrices to the importer-neutral case, branches with a tap ratio or phase shift are transformers
+    case = new_case(name, base_mva)
+    bus_names = {int(n): f"Bus{int(n)}" for n in bus[:, BUS_I]}
+
+    for row in bus:
+        label = bus_names[int(row[BUS_I])]
+        append(case["buses"], name=label, base_kv=row[BASE_KV], type=int(row[BUS_TYPE]), vm=row[VM], va=row[VA])
+        if row[PD] != 0 or row[QD] != 0:
+            append(case["loads"], name=f"L{label[3:]}", bus=label, p=row[PD], q=row[QD])
+        if row[GS] != 0 or row[BS] != 0:
+            append(case["shunts"], name=f"SH{label[3:]}", bus=label, g=row[GS], b=row[BS])
+
+    for k, row in enumerate(gen, start=1):
+        append(case["generators"], name=f"G{k}", bus=bus_names[int(row[GEN_BUS])], p=row[PG], q=row[QG], vg=row[VG],
+               status=row[GEN_STATUS] > 0)
+
+    for k, row in enumerate(branch, start=1):
+        f, t = bus_names[int(row[F_BUS])], bus_names[int(row[T_BUS])]
+        status = row[BR_STATUS] > 0 if branch.shape[1] > BR_STATUS else True
+        if row[TAP] != 0 or row[SHIFT] != 0:
+            append(case["transformers"], name=f"T{k}", bus1=f, bus2=t, r=row[BR_R], x=row[BR_X], rating=row[RATE_A],
+                   tap=row[TAP] if row[TAP] != 0 else 1.0, shift=row[SHIFT], b=row[BR_B], status=status,
+                   connection=None, grounding=None)
+        else:
+            append(case["lines"], name=f"Line{k}", bus1=f, bus2=t, r=row[BR_R], x=row[BR_X], b=row[BR_B],
+                   rating=row[RATE_A], status=status)
+
+    return case
+
+
+def split_record(line: str):
+    # fields of one RAW record, comma or blank separated, quotes removed, the "/" comment cut off
+    line = line.replace('"', "'")
+    quoted = False
+    for k, character in enumerate(line):
+        if character == "'":
+            quoted = not quoted
+        elif character == "/" and not quoted:
+            line = line[:k]
+            break
+    fields = _comma.split(line) if "," in line else _token.findall(line)
+    return [field.strip().strip("'").strip() for field in fields]
+
+
+def number(fields, k, default=0.0):
+    return float(fields[k]) if k < len(fields) and fields[k] != "" else default
+
+
+def read_psse_raw(path: str, name: str = None):
+    # PSS/E RAW case (v33 and later), read record by record
+    # buses, loads, fixed and switched shunts (at their initial value), generators, branches, switching devices and
+    # two- and three-winding transformers are imported; the other sections are skipped
+
+    with open(path) as file:
+        raw = (line for line in file if not line.startswith("@!"))
+        header = split_record(next(raw))
+        base_mva = number(header, 1, 100.0)
+        revision = int(number(header, 2, 33))
+        next(raw), next(raw)  # two title lines, possibly blank
+        lines = (line for line in raw if line.strip())
+
+        case = new_case(name or os.path.splitext(os.path.basename(path))[0], base_mva)
+        sections = psse_sections[33 if revision < 34 else 34]
+        section = 0
+        base_kv = {}
+        system_wide = False  # v35 system-wide data before the bus data
+
+        def bus_name(number_field):
+            return f"Bus{abs(int(float(number_field)))}"
+
+        for line in lines:
+            fields = split_record(line)
+            if not fields or fields[0] == "":
+                continue
+            if fields[0].upper() == "Q":
+                break
+            if fields[0] == "0":
+                if system_wide:
+                    system_wide = False
+                else:
+                    section += 1
+                if section == len(sections):
+                    break
+                continue
+
+            kind = sections[section]
+            if kind == "bus":
+                if not re.match(r"^-?\d", fields[0]):
+                    system_wide = True
+                if system_wide:
+                    continue
+                bus = bus_name(fields[0])
+                base_kv[bus] = number(fields, 2)
+                append(case["buses"], name=bus, base_kv=base_kv[bus], type=int(number(fields, 3, 1)),
+                       vm=number(fields, 7, 1.0), va=number(fields, 8))
+
+            elif kind == "load":
+                if number(fields, 2, 1) == 0:
+                    continue
+                bus = bus_name(fields[0])
+                # constant-current parts at 1 p.u. voltage, constant-admittance parts as shunts
+                append(case["loads"], name=f"L{bus[3:]}_{fields[1]}", bus=bus, p=number(fields, 5) + number(fields, 7),
+                       q=number(fields, 6) + number(fields, 8))
+                if number(fields, 9) != 0 or number(fields, 10) != 0:
+                    append(case["shunts"], name=f"L{bus[3:]}_{fields[1]}_y", bus=bus, g=number(fields, 9), b=-number(fields, 10))
+
+            elif kind == "fixed_shunt":
+                if number(fields, 2, 1) != 0:
+                    bus = bus_name(fields[0])
+                    append(case["shunts"], name=f"SH{bus[3:]}_{fields[1]}", bus=bus, g=number(fields, 3), b=number(fields, 4))
+
+            elif kind == "generator":
+                bus = bus_name(fields[0])
+                append(case["generators"], name=f"G{bus[3:]}_{fields[1]}", bus=bus, p=number(fields, 2), q=number(fields, 3),
+                       vg=number(fields, 6, 1.0), status=number(fields, 14 if revision < 35 else 15, 1) > 0)
+
+            elif kind == "branch":
+                f, t, circuit_id = bus_name(fields[0]), bus_name(fields[1]), fields[2]
+                offset = 0 if revision < 34 else 1  # v34 adds the branch name and twelve ratings
+                rating = number(fields, 6 + offset)
+                shunt = 9 if revision < 34 else 19
+                name = f"Line{f[3:]}-{t[3:]}-{circuit_id}"
+                append(case["lines"], name=name, bus1=f, bus2=t, r=number(fields, 3), x=number(fields, 4),
+                       b=number(fields, 5), rating=rating, status=number(fields, shunt + 4, 1) > 0)
+                for end, bus, k in (("from", f, shunt), ("to", t, shunt + 2)):
+                    if number(fields, k) != 0 or number(fields, k + 1) != 0:
+                        append(case["shunts"], name=f"{name}_{end}", bus=bus, g=number(fields, k) * base_mva,
+                               b=number(fields, k + 1) * base_mva)
+
+            elif kind == "switching_device":
+                f, t = bus_name(fields[0]), bus_name(fields[1])
+                append(case["lines"], name=f"Switch{f[3:]}-{t[3:]}-{fields[2]}", bus1=f, bus2=t, r=0.0,
+                       x=max(number(fields, 3, 1e-4), 1e-4), b=0.0, rating=number(fields, 4), status=number(fields, 16, 1) > 0)
+
+            elif kind == "transformer":
+                windings = 2 if int(number(fields, 2)) == 0 else 3
+                records = [split_record(next(lines)) for _ in range(windings + 1)]
+                read_psse_transformer(case, fields, records, base_kv, base_mva, bus_name)
+
+            elif kind == "switched_shunt":
+                status, initial = (3, 9 if revision < 34 else 10) if revision < 35 else (4, 11)
+                if number(fields, status, 1) != 0 and number(fields, initial) != 0:
+                    bus = bus_name(fields[0])
+                    append(case["shunts"], name=f"SW{bus[3:]}_{len(case['shunts']['name'])}", bus=bus, g=0.0,
+                           b=number(fields, initial))
+
+    return build_circuit(case)
+
+
+def winding_connection(vector_group: str):
+    # connection type and neutral grounding from a PSS/E vector group (YN grounded, Y ungrounded, D delta),
+    # None if the code is missing or not recognized
+    match = _vector_group.fullmatch(vector_group.strip().upper())
+    if match is None:
+        return None
+    sides = match.groups()
+    connection = "-".join("DELTA" if side == "D" else "Y" for side in sides)
+    grounding = None if "Y" in sides else 0.0  # an ungrounded wye has no zero-sequence path
+    return connection, grounding
+
+
+def read_psse_transformer(case, fields, records, base_kv, base_mva, bus_name):
+    # one two- or three-winding transformer record; a three-winding one becomes three branches to a star bus
+    buses = [bus_name(fields[0]), bus_name(fields[1])] + ([bus_name(fields[2])] if len(records) == 4 else [])
+    circuit_id = fields[3]
+    cw, cz = int(number(fields, 4, 1)), int(number(fields, 5, 1))
+    status = int(number(fields, 11, 1))
+    impedances = records[0]
+    windings = records[1:]
+
+    def pair_impedance(k):
+        # R and X of a winding pair in per unit on the case base
+        r, x, sbase = number(impedances, 3 * k), number(impedances, 3 * k + 1), number(impedances, 3 * k + 2, base_mva)
+        if cz == 3:  # load loss in W and |Z| in per unit on the winding base
+            r = r / 1e6 / sbase
+            x = np.sqrt(max(x ** 2 - r ** 2, 0.0))
+        if cz in (2, 3):
+            r, x = r * base_mva / sbase, x * base_mva / sbase
+        return complex(r, x)
+
+    def tap(w):
+        # off-nominal ratio of winding w in per unit of its bus voltage
+        ratio, nominal = number(windings[w], 0, 1.0), number(windings[w], 1)
+        kv = base_kv.get(buses[w], 0) or 1.0
+        if cw == 2:
+            return ratio / kv
+        if cw == 3:
+            return ratio * (nominal or kv) / kv
+        return ratio
+
+    name = f"T{buses[0][3:]}-{buses[1][3:]}"
+    if len(buses) == 2:
+        z = pair_impedance(0)
+        # VECGRP (v33+) is the winding connection
+        connection, grounding = winding_connection(fields[20] if len(fields) > 20 else "") or (None, None)
+        append(case["transformers"], name=f"{name}-{circuit_id}", bus1=buses[0], bus2=buses[1], r=z.real, x=z.imag,
+               rating=number(windings[0], 3), tap=tap(0) / tap(1), shift=number(windings[0], 2), b=0.0,
+               status=status != 0, connection=connection, grounding=grounding)
+        return
+
+    # star equivalent of the three pair impedances
+    z12, z23, z31 = pair_impedance(0), pair_impedance(1), pair_impedance(2)
+    star_z = [(z12 + z31 - z23) / 2, (z12 + z23 - z31) / 2, (z23 + z31 - z12) / 2]
+    star = f"Star{buses[0][3:]}-{buses[1][3:]}-{buses[2][3:]}-{circuit_id}"
+    append(case["buses"], name=star, base_kv=base_kv.get(buses[0], 0), type=1, vm=number(impedances, 9, 1.0),
+           va=number(impedances, 10))
+    in_service = {0: (False, False, False), 2: (True, False, True), 3: (True, True, False), 4: (False, True, True)}
+    for w in range(3):
+        z = star_z[w] if star_z[w] != 0 else 1e-4j
+        append(case["transformers"], name=f"{name}-{buses[2][3:]}-{circuit_id}-{w + 1}", bus1=buses[w], bus2=star,
+               r=z.real, x=z.imag, rating=number(windings[w], 3), tap=tap(w), shift=number(windings[w], 2), b=0.0,
+               status=in_service.get(status, (True, True, True))[w], connection=None, grounding=None)
+
+
+def build_circuit(case):
+    # circuit from an importer-neutral case through the bulk add_* path
+    # isolated buses are left out with everything connected to them, generators at PQ buses become negative loads
+    # (the generators of this model always regulate their bus voltage), phase shifts are not modeled
+
+    circuit = Circuit(case["name"])
+    scale = SystemSettings.Sbase / case["base_mva"]  # case-base to system-base per unit impedance
+
+    names = ("name", "bus1", "bus2", "bus", "connection", "grounding")
+    buses = {key: np.asarray(values, dtype=object if key == "name" else float) for key, values in case["buses"].items()}
+    keep = buses["type"] != 4
+    bus_type = dict(zip(buses["name"][keep], buses["type"][keep]))
+    base_kv = np.where(buses["base_kv"][keep] > 0, buses["base_kv"][keep], 1.0)  # no voltage level given: 1 kV
+    circuit.add_buses(buses["name"][keep], base_kv)
+    for bus, vm, va in zip(buses["name"][keep], buses["vm"][keep], buses["va"][keep]):
+        circuit.buses[bus].vpu = float(vm)
+        circuit.buses[bus].delta = float(np.radians(va))
+
+    def columns(key):
+        # device columns as arrays (names stay Python strings), devices at left-out buses dropped
+        table = {field: np.asarray(values, dtype=object if field in names else float)
+                 for field, values in case[key].items()}
+        connected = np.ones(len(table["name"]), dtype=bool)
+        for field in ("bus1", "bus2", "bus"):
+            if field in table:
+                connected &= np.array([bus in bus_type for bus in table[field]], dtype=bool)
+        return {field: values[connected] for field, values in table.items()}
+
+    lines = columns("lines")
+    lines["x"] = np.where((lines["r"] == 0) & (lines["x"] == 0), 1e-4, lines["x"])  # zero-impedance ties
+    circuit.add_tlines_impedance(lines["name"], lines["bus1"], lines["bus2"], lines["r"] * scale, lines["x"] * scale,
+                                 lines["b"] / scale, lines["rating"], lines["status"])
+
+    transformers = columns("transformers")
+    shifted = np.count_nonzero(transformers["shift"] != 0)
+    if shifted:
+        # a warning rather than a print, so callers can filter or escalate it
+        warnings.warn(f"{shifted} transformer phase shifts are not modeled and were ignored.")
+    missing = np.array([connection is None for connection in transformers["connection"]], dtype=bool)
+    if missing.any():
+        warnings.warn(f"{np.count_nonzero(missing)} transformers have no winding connection data, their neutrals are "
+                      f"left ungrounded (no zero-sequence path).")
+    transformers["connection"][missing] = "Y-Y"
+    transformers["x"] = np.where((transformers["r"] == 0) & (transformers["x"] == 0), 1e-4, transformers["x"])
+    circuit.add_transformers_impedance(transformers["name"], transformers["bus1"], transformers["bus2"],
+                                       transformers["r"] * scale, transformers["x"] * scale, transformers["rating"],
+                                       transformers["tap"], transformers["status"], transformers["b"] / scale,
+                                       transformers["connection"], transformers["grounding"])
+
+    generators = columns("generators")
+    on = generators["status"].astype(bool)
+    regulating = on & np.array([bus_type[bus] in (2, 3) for bus in generators["bus"]], dtype=bool)
+    kv = np.array([circuit.buses[bus].base_kv for bus in generators["bus"]], dtype=float)
+    circuit.add_generators(generators["name"][regulating], generators["bus"][regulating],
+                           generators["vg"][regulating] * kv[regulating], generators["p"][regulating])
+    for bus, vg in zip(generators["bus"][regulating][::-1], generators["vg"][regulating][::-1]):
+        circuit.buses[bus].vpu = float(vg)  # the first generator of a bus sets its voltage
+
+    loads = columns("loads")
+    fixed = on & ~regulating
+    circuit.add_loads(np.concatenate((loads["name"], generators["name"][fixed])),
+                      np.concatenate((loads["bus"], generators["bus"][fixed])),
+                      np.concatenate((loads["p"], -generators["p"][fixed])),
+                      np.concatenate((loads["q"], -generators["q"][fixed])))
+
+    shunts = columns("shunts")
+    circuit.add_shunts(shunts["name"], shunts["bus"], shunts["g"], shunts["b"])
+
+    reference = [bus for bus, kind in bus_type.items() if kind == 3]
+    if not reference:
+        raise ValueError("The case has no reference bus.")
+    if reference[0] not in set(generators["bus"][regulating]):
+        raise ValueError(f"The reference bus '{reference[0]}' has no generator in service.")
+    circuit.set_slack_bus(reference[0])
+
+    return circuit
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from Solution import Solution
+
+    # python CaseImport.py case.m (or .mat, .raw)
+    if len(sys.argv) < 2:
+        print("Usage: python CaseImport.py <case file>")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    circuit1 = read_case(sys.argv[1])
+    print(f"Read {len(circuit1.buses)} buses, {len(circuit1.transmissionlines)} lines, {len(circuit1.transformers)} "
+          f"transformers and {len(circuit1.generators)} generators in {time.perf_counter() - start:.2f} s")
+
+    solution = Solution(circuit1)
+    solution.power_flow(tolerance=1e-6)
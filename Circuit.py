@@ -5,6 +5,8 @@
 from typing import Dict
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
 
 pd.set_option('display.max_columns', None)  # show all columns
 pd.set_option('display.width', 1000)  # increase width to prevent wrapping
@@ -18,6 +20,12 @@ from TransmissionLine import TransmissionLine
 from Transformer import Transformer
 from Generator import Generator
 from Load import Load
+from Shunt import Shunt
+from DeviceTable import DeviceTable
+from SparseLU import SparseLU, UpdatedFactor
+from SparseYbus import assemble_ybus, branch_triplets
+from ZbusProvider import ZbusProvider
+from SystemSettings import SystemSettings
 
 class Circuit:
 
@@ -31,14 +39,33 @@ class Circuit:
         self.transmissionlines: Dict[str, TransmissionLine] = {}
         self.generators: Dict[str, Generator] = {}
         self.loads: Dict[str, Load] = {}
+        self.shunts: Dict[str, Shunt] = {}
+
+        # struct-of-arrays device tables, one record per device
+        self.line_table = DeviceTable(TransmissionLine.table_dtype)
+        self.transformer_table = DeviceTable(Transformer.table_dtype)
+        self.generator_table = DeviceTable(Generator.table_dtype)
+        self.load_table = DeviceTable(Load.table_dtype)
+        self.shunt_table = DeviceTable(Shunt.table_dtype)
+
+        # bus name -> integer position, frozen once the topology is finalized
+        self.bus_index: Dict[str, int] = {}
+        self.topology_frozen = False
 
         self.slack_bus = None
 
-        self.ybus = self.calc_ybus()
-        self.ybus_pos = self.calc_ybus_pos_sequence()
-        self.ybus_neg = self.calc_ybus_neg_sequence()
-        self.ybus_zero = self.calc_ybus_zero_sequence()
-        self.zbus_pos, self.zbus_neg, self.zbus_zero = self.calc_sequence_zbuses()
+        # bumped by every add_*/set_slack_bus, network matrices are rebuilt at most once per version
+        self.version = 0
+        self._cache = {}
+
+        # bumped by outage/restore, which keep the version (and the cached matrices, updated in place)
+        self.status_version = 0
+
+    def __getstate__(self):
+        # cached matrices and factors are rebuilt on demand, SuperLU objects cannot be pickled anyway
+        state = self.__dict__.copy()
+        state["_cache"] = {}
+        return state
 
     def add_bus(self, bus: str, base_kv: float):
 
@@ -46,7 +73,139 @@ class Circuit:
 
         if bus in self.buses:
             raise ValueError(f"Bus '{bus}' already exists.")
-        self.buses[bus] = Bus(bus, base_kv)
+        if self.topology_frozen:
+            raise ValueError(f"Cannot add bus '{bus}', the topology of '{self.name}' is frozen.")
+
+        self.bus_index[bus] = len(self.buses)
+        self.buses[bus] = Bus(bus, base_kv, self.bus_index[bus])
+        self.version += 1
+
+    def freeze_topology(self):
+
+        # fix the bus name -> index map, no buses can be added afterwards
+
+        self.topology_frozen = True
+        return self.bus_index
+
+    def outage(self, name: str):
+        self.set_branch_status(name, False)
+
+    def restore(self, name: str):
+        self.set_branch_status(name, True)
+
+    def set_branch_status(self, name: str, in_service: bool):
+        # switches a line or transformer without bumping the circuit version
+        # cached sparse Ybus matrices are updated in place (same pattern, so the Jacobian ordering stays valid)
+        # and cached DC, fast-decoupled and Zbus factors get low-rank corrections instead of a refactorization
+
+        if name in self.transmissionlines:
+            branch = self.transmissionlines[name]
+            position = branch.row
+        elif name in self.transformers:
+            branch = self.transformers[name]
+            position = len(self.line_table) + branch.row
+        else:
+            raise ValueError(f"Branch '{name}' not found.")
+
+        if branch.in_service == bool(in_service):
+            return
+
+        sequences = {"ybus_sparse": "network", "ybus_pos_sparse": "pos", "ybus_neg_sparse": "neg", "ybus_zero_sparse": "zero"}
+        variants = [variant for variant in ("XB", "BX") if self._fresh(f"fdlf_factors_{variant}") is not None]
+        dc_cached = self._fresh("dc_factor") is not None
+
+        def reduced_matrices():
+            # only for the factors that are actually cached
+            B = self.calc_dc_matrices()[0][self.pv_pq_idx][:, self.pv_pq_idx] if dc_cached else None
+            fdlf = {}
+            for variant in variants:
+                bprime, bdoubleprime = self.calc_fdlf_matrices(variant)
+                fdlf[variant] = (bprime[self.pv_pq_idx][:, self.pv_pq_idx], bdoubleprime[self.pq_idx][:, self.pq_idx])
+            return B, fdlf
+
+        primitives_before = {sequence: self.calc_branch_primitives(sequence) for sequence in sequences.values()}
+        B_before, fdlf_before = reduced_matrices()
+
+        branch.table.set("in_service", branch.row, bool(in_service))
+        self.status_version += 1
+
+        B_after, fdlf_after = reduced_matrices()
+
+        # rank-2 (rank-1 without shunts) change of each sequence Ybus at the branch terminals
+        for key, sequence in sequences.items():
+            ybus = self._fresh(key, self.calc_sequence_tables(sequence))
+            if ybus is None:
+                continue
+            from_idx, to_idx, y_ff, y_ft, y_tt = self.calc_branch_primitives(sequence)
+            _, _, y_ff0, y_ft0, y_tt0 = primitives_before[sequence]
+            b = [position]
+            ybus.add(*branch_triplets(from_idx[b], to_idx[b], y_ff[b] - y_ff0[b], y_ft[b] - y_ft0[b], y_ft[b] - y_ft0[b],
+                                      y_tt[b] - y_tt0[b]))
+
+        for sequence in ("pos", "neg", "zero"):
+            provider = self._fresh(f"zbus_{sequence}_provider", self.calc_sequence_tables(sequence))
+            if provider is None:
+                continue
+            try:
+                provider.update(getattr(self, f"ybus_{sequence}_sparse"))
+            except np.linalg.LinAlgError:
+                self._cache.pop(f"zbus_{sequence}_provider")  # rebuilt (and reported singular) on next use
+
+        self._update_factor("dc_factor", B_before, B_after)
+        for variant in variants:
+            key = f"fdlf_factors_{variant}"
+            stamp, (bprime_factor, bdoubleprime_factor) = self._cache[key]
+            if variant == "XB":
+                bprime_factor = self._fresh("dc_factor")  # still shared with the DC power flow
+            else:
+                bprime_factor = self.calc_updated_factor(bprime_factor, fdlf_before[variant][0], fdlf_after[variant][0])
+            bdoubleprime_factor = self.calc_updated_factor(bdoubleprime_factor, fdlf_before[variant][1], fdlf_after[variant][1])
+            if bprime_factor is None or bdoubleprime_factor is None:
+                self._cache.pop(key)
+            else:
+                self._cache[key] = (stamp, (bprime_factor, bdoubleprime_factor))
+
+        # cheap to rebuild from the tables
+        for key in ("dc_matrices", "branch_admittances_network", "branch_admittances_pos", "branch_admittances_neg",
+                    "branch_admittances_zero", "ybus", "ybus_pos", "ybus_neg", "ybus_zero", "zbus_pos", "zbus_neg", "zbus_zero"):
+            self._cache.pop(key, None)
+
+    def calc_updated_factor(self, factor, before, after):
+        # factor of after from the factor of before (or of the matrix it was updated from), None if after is singular
+        if isinstance(factor, UpdatedFactor):
+            factor, before = factor.base_factor, factor.base_matrix
+        try:
+            updated = UpdatedFactor(factor, before, after)
+        except np.linalg.LinAlgError:
+            return None
+        return factor if updated.rank == 0 else updated
+
+    def _update_factor(self, key, before, after):
+        factor = self._fresh(key)
+        if factor is None:
+            return
+        updated = self.calc_updated_factor(factor, before, after)
+        if updated is None:
+            self._cache.pop(key)
+        else:
+            self._cache[key] = (self._cache[key][0], updated)
+
+    def calc_bus_types(self):
+        # bus type code of every bus, ordered by bus index
+        return np.array([Bus.type_codes[bus.bus_type] for bus in self.buses.values()], dtype=np.int8)
+
+    def calc_power_specified(self):
+        # net specified P and Q injection at every bus in per unit, ordered by bus index
+
+        N = len(self.buses)
+        gens = self.generator_table.data
+        loads = self.load_table.data
+
+        p_specified = (np.bincount(gens["bus"], weights=gens["mw_setpoint"], minlength=N)
+                       - np.bincount(loads["bus"], weights=loads["real_power"], minlength=N)) / SystemSettings.Sbase
+        q_specified = -np.bincount(loads["bus"], weights=loads["reactive_power"], minlength=N) / SystemSettings.Sbase
+
+        return p_specified, q_specified
 
     def add_transformer(self, name: str, bus1_name: str, bus2_name: str, power_rating: float,
                         impedance_percent: float, x_over_r_ratio: float, connection_type: str, grounding_impedance: float):
@@ -63,7 +222,9 @@ class Circuit:
         bus1 = self.buses[bus1_name]
         bus2 = self.buses[bus2_name]
 
-        self.transformers[name] = Transformer(name, bus1, bus2, power_rating, impedance_percent, x_over_r_ratio, connection_type, grounding_impedance)
+        self.transformers[name] = Transformer(name, bus1, bus2, power_rating, impedance_percent, x_over_r_ratio, connection_type, grounding_impedance,
+                                              self.transformer_table)
+        self.version += 1
 
     def add_conductor(self, name: str, diam: float, gmr: float, resistance: float, ampacity: float):
 
@@ -72,6 +233,7 @@ class Circuit:
         if name in self.conductors:
             raise ValueError(f"Conductor '{name}' already exists.")
         self.conductors[name] = Conductor(name, diam, gmr, resistance, ampacity)
+        self.version += 1
 
     def add_bundle(self, name: str, num_conductors: int, spacing: float, conductor_name: str):
 
@@ -84,6 +246,7 @@ class Circuit:
 
         conductor = self.conductors[conductor_name]
         self.bundles[name] = Bundle(name, num_conductors, spacing, conductor)
+        self.version += 1
 
     def add_geometry(self, name: str, xa: float, ya: float, xb: float, yb: float, xc: float, yc: float):
 
@@ -92,6 +255,7 @@ class Circuit:
         if name in self.geometries:
             raise ValueError(f"Geometry '{name}' already exists.")
         self.geometries[name] = Geometry(name, xa, ya, xb, yb, xc, yc)
+        self.version += 1
 
     def add_tline(self, name: str, bus1_name: str, bus2_name: str, bundle_name: str, geometry_name: str, length: float):
 
@@ -113,7 +277,8 @@ class Circuit:
         bundle = self.bundles[bundle_name]
         geometry = self.geometries[geometry_name]
 
-        self.transmissionlines[name] = TransmissionLine(name, bus1, bus2, bundle, geometry, length)
+        self.transmissionlines[name] = TransmissionLine(name, bus1, bus2, bundle, geometry, length, self.line_table)
+        self.version += 1
 
     def add_generator(self, name: str, bus: Bus, voltage_setpoint: float, mw_setpoint: float, grounding_impedance: float, is_grounded: bool = True):
 
@@ -132,7 +297,9 @@ class Circuit:
         else:
             bus_obj.bus_type = "PV Bus"
 
-        self.generators[name] = Generator(name, bus_obj, voltage_setpoint, mw_setpoint, grounding_impedance, is_grounded)
+        self.generators[name] = Generator(name, bus_obj, voltage_setpoint, mw_setpoint, grounding_impedance, is_grounded,
+                                          self.generator_table)
+        self.version += 1
 
     def set_slack_bus(self, bus_name: str):
         if bus_name not in self.buses:
@@ -147,150 +314,624 @@ class Circuit:
         # Set the new slack bus
         self.slack_bus = bus_name
         self.buses[bus_name].bus_type = "Slack Bus"
+        self.version += 1
 
     def add_load(self, name: str, bus: str, real_power: float, reactive_power: float):
 
-        # add a generator to the circuit
+        # add a load to the circuit
 
         if name in self.loads:
             raise ValueError(f"Load '{name}' already exists.")
 
-        self.loads[name] = Load(name, self.buses[bus], real_power, reactive_power)
+        self.loads[name] = Load(name, self.buses[bus], real_power, reactive_power, self.load_table)
+        self.version += 1
+
+    def add_shunt(self, name: str, bus: str, g: float, b: float):
+
+        # add a fixed shunt to the circuit, g MW consumed and b Mvar injected at 1 p.u. voltage
+
+        self.add_shunts([name], [bus], [g], [b])
+
+    def add_tline_impedance(self, name: str, bus1_name: str, bus2_name: str, r: float, x: float, b: float,
+                            rating: float = 0):
 
-        self.calc_ybus_pos_sequence()
+        # adds a Transmission Line from per-unit R, X and total charging B on the system base, rating in MVA (0 unlimited)
+
+        self.add_tlines_impedance([name], [bus1_name], [bus2_name], [r], [x], [b], [rating])
+
+    def add_transformer_impedance(self, name: str, bus1_name: str, bus2_name: str, r: float, x: float,
+                                  power_rating: float = 0, tap: float = 1.0, b: float = 0, connection_type: str = "Y-Y",
+                                  grounding_impedance: float = 0):
+
+        # adds a transformer from per-unit R, X and total charging B on the system base and an off-nominal tap at bus1
+
+        self.add_transformers_impedance([name], [bus1_name], [bus2_name], [r], [x], [power_rating], [tap], b=[b],
+                                        connection_type=connection_type, grounding_impedance=grounding_impedance)
+
+    # bulk path for imported cases: one validation pass, one table write and one version bump per device type
+
+    def check_new_names(self, names, existing, kind: str):
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate {kind} names.")
+        for name in names:
+            if name in existing:
+                raise ValueError(f"{kind} '{name}' already exists.")
+
+    def calc_bus_rows(self, bus_names):
+        # bus indices of bus names
+        try:
+            return np.array([self.bus_index[bus] for bus in bus_names], dtype=np.int64)
+        except KeyError as error:
+            raise ValueError(f"Bus '{error.args[0]}' does not exist in the circuit.") from None
+
+    def add_buses(self, names, base_kvs):
+        names = list(names)
+        if self.topology_frozen:
+            raise ValueError(f"Cannot add buses, the topology of '{self.name}' is frozen.")
+        self.check_new_names(names, self.buses, "Bus")
+
+        for name, base_kv in zip(names, base_kvs):
+            self.bus_index[name] = len(self.buses)
+            self.buses[name] = Bus(name, float(base_kv), self.bus_index[name])
+        self.version += 1
+
+    def add_tlines_impedance(self, names, bus1_names, bus2_names, r, x, b, rating=None, in_service=None):
+        # lines from per-unit R, X and total charging B on the system base, ratings in MVA (0 for unlimited)
+        names = list(names)
+        self.check_new_names(names, self.transmissionlines, "Transmission Line")
+        bus1 = self.calc_bus_rows(bus1_names)
+        bus2 = self.calc_bus_rows(bus2_names)
+        n = len(names)
+
+        r, x, b = (np.asarray(values, dtype=float) for values in (r, x, b))
+        if np.any((r == 0) & (x == 0)):
+            raise ValueError("Transmission Lines need a nonzero impedance.")
+        rating = np.zeros(n) if rating is None else np.asarray(rating, dtype=float)
+        in_service = np.ones(n, dtype=bool) if in_service is None else np.asarray(in_service, dtype=bool)
+
+        # bundle ampacity equivalent to the MVA rating at the bus2 voltage, like calc_branch_ratings
+        base_kv = np.array([bus.base_kv for bus in self.buses.values()], dtype=float)[bus2]
+        with np.errstate(divide="ignore"):
+            ampacity = np.where(rating > 0, rating * 1000 / (np.sqrt(3) * base_kv), np.inf)
+
+        z1 = r + 1j * x
+        rows = self.line_table.extend(n, bus1=bus1, bus2=bus2, r1=r, x1=x, b1=b, r2=r, x2=x, b2=b,
+                                      r0=2.5 * r, x0=2.5 * x, b0=b, y1=1 / z1, y2=1 / z1, y0=1 / (2.5 * z1),
+                                      ysh1=1j * b, ysh2=1j * b, ysh0=1j * b, ampacity=ampacity, in_service=in_service)
+
+        buses = list(self.buses.values())
+        for name, i, j, row in zip(names, bus1, bus2, rows):
+            self.transmissionlines[name] = TransmissionLine(name, buses[i], buses[j], None, None, None, self.line_table, int(row))
+        self.version += 1
+
+    def add_transformers_impedance(self, names, bus1_names, bus2_names, r, x, power_rating=None, tap=None, in_service=None,
+                                   b=None, connection_type: str = "Y-Y", grounding_impedance: float = 0):
+        # transformers from per-unit R, X and charging B on the system base, MVA ratings (0 for unlimited) and
+        # off-nominal taps at bus1; connection_type and grounding_impedance are one value or one per transformer
+        names = list(names)
+        self.check_new_names(names, self.transformers, "Transformer")
+        bus1 = self.calc_bus_rows(bus1_names)
+        bus2 = self.calc_bus_rows(bus2_names)
+        n = len(names)
+
+        connection_types = [connection_type] * n if isinstance(connection_type, str) else list(connection_type)
+        connection_types = [connection.upper() for connection in connection_types]
+        for connection in connection_types:
+            if connection not in Transformer.connection_codes:
+                raise ValueError(f"Invalid connection type: {connection}")
+        if grounding_impedance is None or np.isscalar(grounding_impedance):
+            grounding_impedance = [grounding_impedance] * n
+        r, x = (np.asarray(values, dtype=float) for values in (r, x))
+        if np.any((r == 0) & (x == 0)):
+            raise ValueError("Transformers need a nonzero impedance.")
+        power_rating = np.zeros(n) if power_rating is None else np.asarray(power_rating, dtype=float)
+        power_rating = np.where(power_rating > 0, power_rating, np.inf)
+        tap = np.ones(n) if tap is None else np.asarray(tap, dtype=float)
+        b = np.zeros(n) if b is None else np.asarray(b, dtype=float)
+        in_service = np.ones(n, dtype=bool) if in_service is None else np.asarray(in_service, dtype=bool)
+
+        z = r + 1j * x
+        connection_codes = np.array([Transformer.connection_codes[connection] for connection in connection_types], dtype=np.int8)
+        rows = self.transformer_table.extend(n, bus1=bus1, bus2=bus2, connection=connection_codes,
+                                             power_rating=power_rating, r=r, x=x, y=1 / z, tap=tap, b=b,
+                                             in_service=in_service)
+
+        # nameplate impedance on the transformer's own rating (system base if unlimited)
+        impedance_percent = np.abs(z) * np.where(np.isfinite(power_rating), power_rating, SystemSettings.Sbase) / SystemSettings.Sbase * 100
+        with np.errstate(divide="ignore"):
+            x_over_r = x / r
+
+        buses = list(self.buses.values())
+        for k, (name, i, j, row) in enumerate(zip(names, bus1, bus2, rows)):
+            self.transformers[name] = Transformer(name, buses[i], buses[j], power_rating[k], impedance_percent[k], x_over_r[k],
+                                                  connection_types[k], grounding_impedance[k], self.transformer_table, int(row))
+        self.version += 1
+
+    def add_generators(self, names, bus_names, voltage_setpoints, mw_setpoints, grounding_impedance: float = 0,
+                       is_grounded: bool = True):
+        # like add_generator, the first generator of the circuit sets the slack bus, voltage setpoints in kV
+        names = list(names)
+        self.check_new_names(names, self.generators, "Generator")
+        bus_rows = self.calc_bus_rows(bus_names)
+        first = len(self.generators) == 0
+
+        rows = self.generator_table.extend(len(names), bus=bus_rows, voltage_setpoint=voltage_setpoints, mw_setpoint=mw_setpoints)
+
+        buses = list(self.buses.values())
+        vset = np.asarray(voltage_setpoints, dtype=float)
+        generators = [Generator(name, buses[i], vset[k], None, grounding_impedance, is_grounded, self.generator_table, int(row))
+                      for k, (name, i, row) in enumerate(zip(names, bus_rows, rows))]
+        self.generator_table.set_rows("y1", rows, [gen.calc_y_positive_sequence() for gen in generators])
+        self.generator_table.set_rows("y2", rows, [gen.calc_y_negative_sequence() for gen in generators])
+        self.generator_table.set_rows("y0", rows, [gen.calc_y_zero_sequence() for gen in generators])
+
+        for gen in generators:
+            self.generators[gen.name] = gen
+            gen.bus.bus_type = "PV Bus"
+        if first and generators:
+            self.slack_bus = generators[0].bus.name
+            generators[0].bus.bus_type = "Slack Bus"
+        self.version += 1
+
+    def add_loads(self, names, bus_names, real_powers, reactive_powers):
+        names = list(names)
+        self.check_new_names(names, self.loads, "Load")
+        bus_rows = self.calc_bus_rows(bus_names)
+
+        p, q = np.asarray(real_powers, dtype=float), np.asarray(reactive_powers, dtype=float)
+        rows = self.load_table.extend(len(names), bus=bus_rows, real_power=p, reactive_power=q,
+                                      y=(p - 1j * q) / SystemSettings.Sbase)  # same per-unit admittance as Load
+
+        buses = list(self.buses.values())
+        for name, i, row in zip(names, bus_rows, rows):
+            self.loads[name] = Load(name, buses[i], None, None, self.load_table, int(row))
+        self.version += 1
+
+    def add_shunts(self, names, bus_names, g, b):
+        names = list(names)
+        self.check_new_names(names, self.shunts, "Shunt")
+        bus_rows = self.calc_bus_rows(bus_names)
+
+        g, b = np.asarray(g, dtype=float), np.asarray(b, dtype=float)
+        rows = self.shunt_table.extend(len(names), bus=bus_rows, g=g, b=b, y=(g + 1j * b) / SystemSettings.Sbase)
+
+        buses = list(self.buses.values())
+        for name, i, row in zip(names, bus_rows, rows):
+            self.shunts[name] = Shunt(name, buses[i], None, None, self.shunt_table, int(row))
+        self.version += 1
+
+    def calc_branch_primitives(self, sequence: str):
+        # from/to bus indices and 2x2 primitive entries (y_ff, y_ft = y_tf, y_tt) of every branch, lines first then transformers
+        # sequence is "network" or "pos" (positive), "neg" or "zero"
+
+        lines = self.line_table.data
+        xfmrs = self.transformer_table.data
+
+        from_idx = np.concatenate((lines["bus1"], xfmrs["bus1"]))
+        to_idx = np.concatenate((lines["bus2"], xfmrs["bus2"]))
+
+        if sequence == "zero":
+            y_line, ysh_line = lines["y0"], lines["ysh0"]
+            # zero sequence depends on the winding connection
+            y_xfmr_ff, y_xfmr_ft, y_xfmr_tt = xfmrs["y0_11"], xfmrs["y0_12"], xfmrs["y0_22"]
+        else:
+            y_line, ysh_line = (lines["y2"], lines["ysh2"]) if sequence == "neg" else (lines["y1"], lines["ysh1"])
+            # off-nominal tap at bus1, charging (imported cases) half at each end
+            tap, ysh_xfmr = xfmrs["tap"], 1j * xfmrs["b"] / 2
+            y_xfmr_ff, y_xfmr_ft, y_xfmr_tt = (xfmrs["y"] + ysh_xfmr) / tap ** 2, -xfmrs["y"] / tap, xfmrs["y"] + ysh_xfmr
+
+        # out-of-service branches keep their entries (zeroed) so the sparsity pattern never changes
+        status = np.concatenate((lines["in_service"], xfmrs["in_service"]))
+        y_ff = np.concatenate((y_line + ysh_line / 2, y_xfmr_ff)) * status
+        y_ft = np.concatenate((-y_line, y_xfmr_ft)) * status
+        y_tt = np.concatenate((y_line + ysh_line / 2, y_xfmr_tt)) * status
+
+        return from_idx, to_idx, y_ff, y_ft, y_tt
+
+    def calc_branch_admittances(self, sequence: str):
+        # Yf and Yt (branches x buses), the currents entering every branch at its from and to end are Yf @ V and Yt @ V
+
+        from_idx, to_idx, y_ff, y_ft, y_tt = self.calc_branch_primitives(sequence)
+        shape = (len(from_idx), len(self.buses))
+        branches = np.arange(len(from_idx))
+
+        yf = sp.coo_matrix((np.concatenate((y_ff, y_ft)), (np.concatenate((branches, branches)), np.concatenate((from_idx, to_idx)))),
+                           shape=shape).tocsr()
+        yt = sp.coo_matrix((np.concatenate((y_ft, y_tt)), (np.concatenate((branches, branches)), np.concatenate((from_idx, to_idx)))),
+                           shape=shape).tocsr()
+
+        return yf, yt
+
+    def calc_branch_flows(self, v):
+        # from/to end flows, losses and loading of every branch (lines first then transformers) for complex bus voltages v
+        # loading is the larger end current over the bundle ampacity for lines, the larger end MVA over power_rating for transformers
+        # v may also be (buses x scenarios), every result is then (branches x scenarios)
+
+        yf, yt = self.branch_admittances("network")
+        from_idx, to_idx, *_ = self.calc_branch_primitives("network")
+        i_from = yf @ v
+        i_to = yt @ v
+        s_from = v[from_idx] * np.conj(i_from) * SystemSettings.Sbase
+        s_to = v[to_idx] * np.conj(i_to) * SystemSettings.Sbase
+        s_loss = s_from + s_to
+
+        n_lines = len(self.line_table)
+        lines = self.line_table.data
+        base_kv = np.array([bus.base_kv for bus in self.buses.values()], dtype=float)
+        ibase = SystemSettings.Sbase * 1000 / (np.sqrt(3) * base_kv[lines["bus2"]])  # [A]
+        column = (slice(None),) + (np.newaxis,) * (np.ndim(v) - 1)  # per-branch constants against a scenario axis
+
+        loading = np.empty(i_from.shape)
+        loading[:n_lines] = (np.maximum(abs(i_from[:n_lines]), abs(i_to[:n_lines])) * ibase[column]
+                             / lines["ampacity"][column] * 100)
+        loading[n_lines:] = (np.maximum(abs(s_from[n_lines:]), abs(s_to[n_lines:]))
+                             / self.transformer_table.data["power_rating"][column] * 100)
+
+        return {
+            "branches": self.branch_names,
+            "p_from": s_from.real,  # [MW] into the branch at bus1
+            "q_from": s_from.imag,  # [Mvar]
+            "p_to": s_to.real,  # [MW] into the branch at bus2
+            "q_to": s_to.imag,
+            "p_loss": s_loss.real,  # [MW] I^2 R
+            "q_loss": s_loss.imag,  # [Mvar] I^2 X less the line charging
+            "i_from": abs(i_from),  # [p.u.]
+            "i_to": abs(i_to),
+            "loading": loading,  # [%]
+        }
+
+    def calc_ybus_triplets(self, sequence: str):
+        # (rows, cols, values) of a sequence network read straight from the device tables
+        # sequence is "network" (branches and fixed shunts only), "pos", "neg" or "zero"
+
+        from_idx, to_idx, y_ff, y_ft, y_tt = self.calc_branch_primitives(sequence)
+        rows, cols, values = branch_triplets(from_idx, to_idx, y_ff, y_ft, y_ft, y_tt)
+        shunts = self.shunt_table.data
+
+        if sequence == "network":
+            return (np.concatenate((rows, shunts["bus"])), np.concatenate((cols, shunts["bus"])),
+                    np.concatenate((values, shunts["y"])))
+
+        # shunt devices only touch the diagonal, loads and fixed shunts are left out of the zero sequence
+        gens = self.generator_table.data
+        loads = self.load_table.data
+        gen_y = {"pos": gens["y1"], "neg": gens["y2"], "zero": gens["y0"]}[sequence]
+
+        if sequence == "zero":
+            shunt_idx, shunt_y = gens["bus"], gen_y
+        else:
+            shunt_idx = np.concatenate((gens["bus"], loads["bus"], shunts["bus"]))
+            shunt_y = np.concatenate((gen_y, loads["y"], shunts["y"]))
+
+        return np.concatenate((rows, shunt_idx)), np.concatenate((cols, shunt_idx)), np.concatenate((values, shunt_y))
+
+    def calc_dc_matrices(self):
+        # B (bus susceptance from 1/x, lossless) and Bf (branch flow = Bf @ angles), lines first then transformers
+
+        lines = self.line_table.data
+        xfmrs = self.transformer_table.data
+        N = len(self.buses)
+
+        from_idx = np.concatenate((lines["bus1"], xfmrs["bus1"]))
+        to_idx = np.concatenate((lines["bus2"], xfmrs["bus2"]))
+        x = np.concatenate((lines["x1"], xfmrs["x"]))
+        x = np.where(x == 0, 1e-4, x)  # zero-reactance ties get 1e-4 p.u.
+        b = np.concatenate((lines["in_service"], xfmrs["in_service"])) / x
+        branches = np.arange(len(b))
+
+        bf = sp.coo_matrix((np.concatenate((b, -b)), (np.concatenate((branches, branches)), np.concatenate((from_idx, to_idx)))),
+                           shape=(len(b), N)).tocsr()
+        B = sp.coo_matrix((np.concatenate((b, b, -b, -b)),
+                           (np.concatenate((from_idx, to_idx, from_idx, to_idx)), np.concatenate((from_idx, to_idx, to_idx, from_idx)))),
+                          shape=(N, N)).tocsr()
+
+        return B, bf
+
+    def calc_dc_factor(self):
+        # B with the slack row and column removed, factorized
+        # singular if out-of-service branches split the network, that is reported instead of SuperLU's error
+        B, _ = self.calc_dc_matrices()
+        _, island = connected_components(abs(B) > 0, directed=False)
+        islanded = np.flatnonzero(island != island[self.bus_index[self.slack_bus]])
+        if len(islanded):
+            names = list(self.buses.keys())
+            raise ValueError(f"The network is islanded, {len(islanded)} buses (e.g. '{names[islanded[0]]}') are not "
+                             f"connected to the slack bus through in-service branches.")
+        return SparseLU().factorize(B[self.pv_pq_idx][:, self.pv_pq_idx])
+
+    def calc_ptdf(self, branches=None, buses=None):
+        # power transfer distribution factors, MW on each branch per MW injected at each bus and taken out at the slack
+        # (branches x buses), rows and columns may be restricted to branch and bus names; one DC factorization serves all
+        # the cheaper side is solved: one solve per selected branch (B is symmetric) or one per selected bus
+
+        B, bf = self.dc_matrices
+        red = self.pv_pq_idx
+        branch_idx = self.calc_branch_positions(branches)
+        bus_idx = np.arange(len(self.buses)) if buses is None else np.array([self.bus_index[bus] for bus in buses], dtype=np.int64)
+
+        ptdf = np.zeros((len(branch_idx), len(bus_idx)))
+        if len(branch_idx) <= len(bus_idx):
+            sens = np.zeros((len(self.buses), len(branch_idx)))
+            sens[red] = self.dc_factor.solve(bf[branch_idx][:, red].T.toarray())  # B_red^-1 Bf_red^T
+            ptdf[:] = sens[bus_idx].T
+        else:
+            rhs = np.zeros((len(self.buses), len(bus_idx)))
+            rhs[bus_idx, np.arange(len(bus_idx))] = 1
+            angles = np.zeros(rhs.shape)
+            angles[red] = self.dc_factor.solve(rhs[red])  # the slack column stays 0
+            ptdf[:] = (bf @ angles)[branch_idx]
+
+        return ptdf
+
+    def calc_lodf(self, branches=None, outages=None):
+        # line outage distribution factors, change of the flow on each branch per MW flowing on the outaged branch
+        # before it opened (branches x outages), -1 where a branch is its own outage
+        # columns of outages that would island part of the network are NaN
+
+        B, bf = self.dc_matrices
+        red = self.pv_pq_idx
+        branch_idx = self.calc_branch_positions(branches)
+        outage_idx = self.calc_branch_positions(outages)
+        from_idx, to_idx, *_ = self.calc_branch_primitives("network")
+
+        # angles for 1 p.u. injected at the from bus and taken out at the to bus of every outaged branch
+        rhs = np.zeros((len(self.buses), len(outage_idx)))
+        rhs[from_idx[outage_idx], np.arange(len(outage_idx))] += 1
+        rhs[to_idx[outage_idx], np.arange(len(outage_idx))] -= 1
+        angles = np.zeros(rhs.shape)
+        angles[red] = self.dc_factor.solve(rhs[red])
+
+        ptdf_transfer = bf @ angles  # (all branches x outages)
+        denominator = 1 - ptdf_transfer[outage_idx, np.arange(len(outage_idx))]
+        islanding = np.abs(denominator) < 1e-8
+
+        lodf = ptdf_transfer[branch_idx] / np.where(islanding, np.nan, denominator)
+        lodf[branch_idx[:, np.newaxis] == outage_idx[np.newaxis, :]] = -1
+        lodf[:, islanding] = np.nan
+
+        return lodf
+
+    def calc_branch_positions(self, branches=None):
+        # positions of branch names in the branch arrays (all branches if None)
+        if branches is None:
+            return np.arange(len(self.line_table) + len(self.transformer_table))
+        positions = {name: k for k, name in enumerate(self.branch_names)}
+        for name in branches:
+            if name not in positions:
+                raise ValueError(f"Branch '{name}' not found.")
+        return np.array([positions[name] for name in branches], dtype=np.int64)
+
+    def calc_branch_ratings(self):
+        # MVA rating of every branch, sqrt(3) kV x bundle ampacity for lines and power_rating for transformers
+        lines = self.line_table.data
+        base_kv = np.array([bus.base_kv for bus in self.buses.values()], dtype=float)
+        line_rating = np.sqrt(3) * base_kv[lines["bus2"]] * lines["ampacity"] / 1000
+        return np.concatenate((line_rating, self.transformer_table.data["power_rating"]))
+
+    def calc_fdlf_matrices(self, variant: str = "XB"):
+        # B' and B'' of the fast-decoupled load flow, full size and ordered by bus index
+        # XB drops the resistance in B', BX drops it in B'', B' never has shunts
+
+        if variant not in ("XB", "BX"):
+            raise ValueError(f"Invalid fast-decoupled variant: {variant}")
+
+        lines = self.line_table.data
+        xfmrs = self.transformer_table.data
+        N = len(self.buses)
+
+        from_idx = np.concatenate((lines["bus1"], xfmrs["bus1"]))
+        to_idx = np.concatenate((lines["bus2"], xfmrs["bus2"]))
+        r = np.concatenate((lines["r1"], xfmrs["r"]))
+        x = np.concatenate((lines["x1"], xfmrs["x"]))
+        x = np.where(x == 0, 1e-4, x)  # zero-reactance ties, as in calc_dc_matrices
+        status = np.concatenate((lines["in_service"], xfmrs["in_service"]))
+        b_shunt = np.concatenate((lines["b1"], xfmrs["b"])) / 2 * status  # half of the charging at each end
+
+        b_x = status / x  # series susceptance without resistance
+        b_rx = -np.imag(1 / (r + 1j * x)) * status  # series susceptance with resistance
+
+        def susceptance_matrix(b_series, with_shunts):
+            rows, cols, values = branch_triplets(from_idx, to_idx, b_series, -b_series, -b_series, b_series)
+            if with_shunts:
+                shunts = self.shunt_table.data
+                rows = np.concatenate((rows, from_idx, to_idx, shunts["bus"]))
+                cols = np.concatenate((cols, from_idx, to_idx, shunts["bus"]))
+                values = np.concatenate((values, -b_shunt, -b_shunt, -shunts["y"].imag))
+            return sp.coo_matrix((values, (rows, cols)), shape=(N, N)).tocsr()
+
+        if variant == "XB":
+            return susceptance_matrix(b_x, False), susceptance_matrix(b_rx, True)
+        return susceptance_matrix(b_rx, False), susceptance_matrix(b_x, True)
+
+    def calc_fdlf_factors(self, variant: str = "XB"):
+        # B' reduced to the non-slack buses and B'' reduced to the PQ buses, both factorized
+        bprime, bdoubleprime = self.calc_fdlf_matrices(variant)
+
+        bdoubleprime = bdoubleprime[self.pq_idx][:, self.pq_idx]
+
+        # the XB B' is the reduced DC power flow matrix, share its factors
+        if variant == "XB":
+            return self.dc_factor, SparseLU().factorize(bdoubleprime)
+
+        bprime = bprime[self.pv_pq_idx][:, self.pv_pq_idx]
+        return SparseLU().factorize(bprime), SparseLU().factorize(bdoubleprime)
 
     def calc_ybus(self):
-        busnames = list(self.buses.keys())
-        N = len(busnames)
-        ybus = pd.DataFrame(np.zeros((N, N), dtype=complex), index=busnames, columns=busnames)
-
-        for line in self.transmissionlines.values():
-            b1, b2 = line.bus1.name, line.bus2.name
-            y = line.yprim
-            ybus.loc[b1, b1] += y.loc[b1, b1]
-            ybus.loc[b2, b2] += y.loc[b2, b2]
-            ybus.loc[b1, b2] += y.loc[b1, b2]
-            ybus.loc[b2, b1] += y.loc[b2, b1]
-
-        for xfmr in self.transformers.values():
-            b1, b2 = xfmr.bus1.name, xfmr.bus2.name
-            y = xfmr.yprim
-            ybus.loc[b1, b1] += y.loc[b1, b1]
-            ybus.loc[b2, b2] += y.loc[b2, b2]
-            ybus.loc[b1, b2] += y.loc[b1, b2]
-            ybus.loc[b2, b1] += y.loc[b2, b1]
-
-
-        self.ybus = ybus
-        return ybus
+        ybus = self.ybus_sparse.to_dataframe()
 
+        return ybus
 
     def calc_ybus_pos_sequence(self):
-        busnames = list(self.buses.keys())
-        N = len(busnames)
-        ybus_pos = pd.DataFrame(np.zeros((N, N), dtype=complex), index=busnames, columns=busnames)
-
-        for line in self.transmissionlines.values():
-            b1, b2 = line.bus1.name, line.bus2.name
-            y = line.yprim
-            ybus_pos.loc[b1, b1] += y.loc[b1, b1]
-            ybus_pos.loc[b2, b2] += y.loc[b2, b2]
-            ybus_pos.loc[b1, b2] += y.loc[b1, b2]
-            ybus_pos.loc[b2, b1] += y.loc[b2, b1]
-
-        for xfmr in self.transformers.values():
-            b1, b2 = xfmr.bus1.name, xfmr.bus2.name
-            y = xfmr.yprim
-            ybus_pos.loc[b1, b1] += y.loc[b1, b1]
-            ybus_pos.loc[b2, b2] += y.loc[b2, b2]
-            ybus_pos.loc[b1, b2] += y.loc[b1, b2]
-            ybus_pos.loc[b2, b1] += y.loc[b2, b1]
-
-        for gen in self.generators.values():
-            b = gen.bus.name
-            ybus_pos.loc[b, b] += gen.y_prim_positive_sequence().loc[b, b]
-
-        for load in self.loads.values():
-            b = load.bus.name
-            ybus_pos.loc[b, b] += load.y_prim().loc[b, b]
-
-        self.ybus_pos = ybus_pos
+        ybus_pos = self.ybus_pos_sparse.to_dataframe()
+
         return ybus_pos
 
     def calc_ybus_neg_sequence(self):
-        busnames = list(self.buses.keys())
-        N = len(busnames)
-        ybus_neg = pd.DataFrame(np.zeros((N, N), dtype=complex), index=busnames, columns=busnames)
-
-        for line in self.transmissionlines.values():
-            b1, b2 = line.bus1.name, line.bus2.name
-            y = line.yprim_neg
-            ybus_neg.loc[b1, b1] += y.loc[b1, b1]
-            ybus_neg.loc[b2, b2] += y.loc[b2, b2]
-            ybus_neg.loc[b1, b2] += y.loc[b1, b2]
-            ybus_neg.loc[b2, b1] += y.loc[b2, b1]
-
-        for xfmr in self.transformers.values():
-            b1, b2 = xfmr.bus1.name, xfmr.bus2.name
-            y = xfmr.yprim_neg
-            ybus_neg.loc[b1, b1] += y.loc[b1, b1]
-            ybus_neg.loc[b2, b2] += y.loc[b2, b2]
-            ybus_neg.loc[b1, b2] += y.loc[b1, b2]
-            ybus_neg.loc[b2, b1] += y.loc[b2, b1]
-
-        for gen in self.generators.values():
-            b = gen.bus.name
-            ybus_neg.loc[b, b] += gen.y_prim_negative_sequence().loc[b, b]
-
-        for load in self.loads.values():
-            b = load.bus.name
-            ybus_neg.loc[b, b] += load.y_prim().loc[b, b]
-
-        self.ybus_neg = ybus_neg
+        ybus_neg = self.ybus_neg_sparse.to_dataframe()
+
         return ybus_neg
 
     def calc_ybus_zero_sequence(self):
-        busnames = list(self.buses.keys())
-        N = len(busnames)
-        ybus_zero = pd.DataFrame(np.zeros((N, N), dtype=complex), index=busnames, columns=busnames)
-
-        for line in self.transmissionlines.values():
-            b1, b2 = line.bus1.name, line.bus2.name
-            y = line.yprim_zero
-            ybus_zero.loc[b1, b1] += y.loc[b1, b1]
-            ybus_zero.loc[b2, b2] += y.loc[b2, b2]
-            ybus_zero.loc[b1, b2] += y.loc[b1, b2]
-            ybus_zero.loc[b2, b1] += y.loc[b2, b1]
-
-        for xfmr in self.transformers.values():
-            b1, b2 = xfmr.bus1.name, xfmr.bus2.name
-            y = xfmr.yprim_zero
-            ybus_zero.loc[b1, b1] += y.loc[b1, b1]
-            ybus_zero.loc[b2, b2] += y.loc[b2, b2]
-            ybus_zero.loc[b1, b2] += y.loc[b1, b2]
-            ybus_zero.loc[b2, b1] += y.loc[b2, b1]
-
-        for gen in self.generators.values():
-            b = gen.bus.name
-            ybus_zero.loc[b, b] += gen.y_prim_zero_sequence().loc[b, b]
-
-
-        self.ybus_zero = ybus_zero
+        ybus_zero = self.ybus_zero_sparse.to_dataframe()
+
         return ybus_zero
 
-    def calc_sequence_zbuses(self):
-        busnames = list(self.buses.keys())  # DO NOT title-case them
+    def calc_sparse_ybuses(self):
+        # ybus, ybus_pos, ybus_neg and ybus_zero as sparse matrices straight from the device tables
+        return self.ybus_sparse, self.ybus_pos_sparse, self.ybus_neg_sparse, self.ybus_zero_sparse
 
+    def calc_zbus_provider(self, ybus_sparse):
+        # sparse LU of one sequence Ybus, Zbus columns are solved from it on demand
         try:
-            self.zbus_pos = pd.DataFrame(np.linalg.inv(self.ybus_pos.values), index=busnames, columns=busnames)
-            self.zbus_neg = pd.DataFrame(np.linalg.inv(self.ybus_neg.values), index=busnames, columns=busnames)
-            self.zbus_zero = pd.DataFrame(np.linalg.inv(self.ybus_zero.values), index=busnames, columns=busnames)
-
-            return self.zbus_pos, self.zbus_neg, self.zbus_zero
-        except np.linalg.LinAlgError:
+            return ZbusProvider(ybus_sparse)
+        except RuntimeError:
             print("One of the Ybus matrices is singular and cannot be inverted.")
-            self.zbus_pos = self.zbus_neg = self.zbus_zero = None
-            return None, None, None
+            return None
+
+    def calc_zbus_dataframe(self, provider):
+        return None if provider is None else provider.to_dataframe()
+
+    def calc_sequence_zbuses(self):
+        return self.zbus_pos, self.zbus_neg, self.zbus_zero
+
+    def _cached(self, key: str, builder, tables=()):
+        # value of key from the cache, rebuilt only if the circuit (or one of the given tables) changed since it was stored
+        stamp = (self.version,) + tuple(table.version for table in tables)
+        cached_stamp, value = self._cache.get(key, (None, None))
+        if cached_stamp != stamp:
+            value = builder()
+            self._cache[key] = (stamp, value)
+        return value
+
+    def _fresh(self, key: str, tables=()):
+        # cached value of key if it is still current, None otherwise
+        stamp = (self.version,) + tuple(table.version for table in tables)
+        cached_stamp, value = self._cache.get(key, (None, None))
+        return value if cached_stamp == stamp else None
+
+    def calc_sequence_tables(self, sequence: str):
+        # tables a sequence network is built from besides the topology, loads are admittances in the positive and
+        # negative sequence, so those matrices are also rebuilt after an in-place P/Q change
+        return (self.load_table,) if sequence in ("pos", "neg") else ()
+
+    # network matrices, computed on first use after every topology change
+
+    @property
+    def ybus_sparse(self):
+        return self._cached("ybus_sparse", lambda: assemble_ybus(list(self.buses.keys()), *self.calc_ybus_triplets("network")))
+
+    @property
+    def ybus_pos_sparse(self):
+        return self._cached("ybus_pos_sparse", lambda: assemble_ybus(list(self.buses.keys()), *self.calc_ybus_triplets("pos")),
+                            self.calc_sequence_tables("pos"))
+
+    @property
+    def ybus_neg_sparse(self):
+        return self._cached("ybus_neg_sparse", lambda: assemble_ybus(list(self.buses.keys()), *self.calc_ybus_triplets("neg")),
+                            self.calc_sequence_tables("neg"))
+
+    @property
+    def ybus_zero_sparse(self):
+        return self._cached("ybus_zero_sparse", lambda: assemble_ybus(list(self.buses.keys()), *self.calc_ybus_triplets("zero")))
+
+    @property
+    def ybus(self):
+        return self._cached("ybus", lambda: self.ybus_sparse.to_dataframe())
+
+    @property
+    def ybus_pos(self):
+        return self._cached("ybus_pos", lambda: self.ybus_pos_sparse.to_dataframe(), self.calc_sequence_tables("pos"))
+
+    @property
+    def ybus_neg(self):
+        return self._cached("ybus_neg", lambda: self.ybus_neg_sparse.to_dataframe(), self.calc_sequence_tables("neg"))
+
+    @property
+    def ybus_zero(self):
+        return self._cached("ybus_zero", lambda: self.ybus_zero_sparse.to_dataframe())
+
+    @property
+    def zbus_pos_provider(self):
+        return self._cached("zbus_pos_provider", lambda: self.calc_zbus_provider(self.ybus_pos_sparse),
+                            self.calc_sequence_tables("pos"))
+
+    @property
+    def zbus_neg_provider(self):
+        return self._cached("zbus_neg_provider", lambda: self.calc_zbus_provider(self.ybus_neg_sparse),
+                            self.calc_sequence_tables("neg"))
+
+    @property
+    def zbus_zero_provider(self):
+        return self._cached("zbus_zero_provider", lambda: self.calc_zbus_provider(self.ybus_zero_sparse))
+
+    # dense Zbus tables for printing, filled column by column from the factors instead of inverting Ybus
+
+    @property
+    def zbus_pos(self):
+        return self._cached("zbus_pos", lambda: self.calc_zbus_dataframe(self.zbus_pos_provider),
+                            self.calc_sequence_tables("pos"))
+
+    @property
+    def zbus_neg(self):
+        return self._cached("zbus_neg", lambda: self.calc_zbus_dataframe(self.zbus_neg_provider),
+                            self.calc_sequence_tables("neg"))
+
+    @property
+    def zbus_zero(self):
+        return self._cached("zbus_zero", lambda: self.calc_zbus_dataframe(self.zbus_zero_provider))
+
+    # bus data used by the power flow, computed once per version
+
+    @property
+    def bus_types(self):
+        return self._cached("bus_types", self.calc_bus_types)
+
+    @property
+    def power_specified(self):
+        # also rebuilt when a load or generator setpoint is changed in place
+        return self._cached("power_specified", self.calc_power_specified, (self.generator_table, self.load_table))
+
+    @property
+    def pv_pq_idx(self):
+        # indices of every non-slack bus, the rows of ΔP
+        return self._cached("pv_pq_idx", lambda: np.flatnonzero(self.bus_types != Bus.SLACK))
+
+    @property
+    def pq_idx(self):
+        # indices of the PQ buses, the rows of ΔQ
+        return self._cached("pq_idx", lambda: np.flatnonzero(self.bus_types == Bus.PQ))
+
+    @property
+    def branch_names(self):
+        # branch order of every branch array, lines first then transformers
+        return self._cached("branch_names", lambda: list(self.transmissionlines.keys()) + list(self.transformers.keys()))
+
+    def branch_admittances(self, sequence: str = "pos"):
+        return self._cached(f"branch_admittances_{sequence}", lambda: self.calc_branch_admittances(sequence))
+
+    @property
+    def dc_matrices(self):
+        return self._cached("dc_matrices", self.calc_dc_matrices)
+
+    @property
+    def dc_factor(self):
+        # reduced DC B factors, reused for every DC solve until the circuit changes
+        return self._cached("dc_factor", self.calc_dc_factor)
+
+    def fdlf_factors(self, variant: str = "XB"):
+        # factors of B' and B'', reused for every half-iteration and every solve until the circuit changes
+        return self._cached(f"fdlf_factors_{variant}", lambda: self.calc_fdlf_factors(variant))
+
+    def calc_fdlf_factorizations(self, variant: str = "XB"):
+        # factorizations the next fdlf_factors(variant) call performs, 0 while the factors are cached
+        if self._fresh(f"fdlf_factors_{variant}") is not None:
+            return 0
+        return 2 if variant == "BX" or self._fresh("dc_factor") is None else 1
+
+    @property
+    def jacobian_lu(self):
+        # sparse LU of the power flow Jacobian, keeps its fill-reducing ordering for the whole version
+        return self._cached("jacobian_lu", SparseLU)
 
 
 if __name__ == "__main__":
@@ -353,3 +994,10 @@ if __name__ == "__main__":
         print("\nZbus Positive Sequence:\n", circuit1.zbus_pos)
         print("\nZbus Negaitve Sequence:\n", circuit1.zbus_neg)
         print("\nZbus Zero Sequence:\n", circuit1.zbus_zero)
+
+        # SPARSE YBUS CHECK (matrices are cached until the circuit changes)
+        print("\nSparse Ybus nonzeros:", circuit1.ybus_sparse.nnz)
+        print("Sparse Ybus reused:", circuit1.ybus_sparse is circuit1.ybus_sparse)
+        ybus_pos_before = circuit1.ybus_pos_sparse
+        circuit1.add_load("L4", "Bus6", 10, 5)
+        print("Sparse Ybus Positive Sequence rebuilt after add_load:", circuit1.ybus_pos_sparse is not ybus_pos_before)
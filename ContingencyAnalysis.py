@@ -0,0 +1,228 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from Circuit import Circuit
+from ExampleCircuit import build_example_circuit
+from Solution import Solution
+
+# per-process state of the pool workers, set up once by init_worker
+_worker = {}
+
+
+def init_worker(circuit, base_state, settings):
+    # every worker unpickles the circuit once and keeps its own Solution (and cached factors) for all its contingencies
+    _worker["solution"] = Solution(circuit)
+    _worker["base_state"] = base_state
+    _worker["settings"] = settings
+
+
+def run_contingencies(names):
+    return [run_contingency(_worker["solution"], name, _worker["base_state"], _worker["settings"]) for name in names]
+
+
+def run_contingency(solution, name, base_state, settings):
+    # one AC outage solved from the base-case voltages, the branch is back in service afterwards
+    # name is a branch name or a tuple of branch names taken out together
+    # returns a compact tuple, the full voltages never leave the worker
+
+    circuit = solution.circuit
+    names = (name,) if isinstance(name, str) else tuple(name)
+    for branch in names:
+        circuit.outage(branch)
+    try:
+        converged = solution.power_flow(tolerance=settings["tolerance"], max_iterations=settings["max_iterations"],
+                                        method=settings["method"], variant=settings["variant"], init=base_state,
+                                        verbose=False)
+        iterations = solution.solve_stats.get("iterations", 0)
+
+        if not converged:
+            return name, False, iterations, np.nan, -1, np.nan, -1, np.nan, -1, 0, 0
+
+        vm = solution.voltages
+        loading = solution.branch_flows()["loading"]
+        k_min, k_max, b_max = int(np.argmin(vm)), int(np.argmax(vm)), int(np.argmax(loading))
+        voltage_violations = int(np.count_nonzero((vm < settings["v_min"]) | (vm > settings["v_max"])))
+        overloads = int(np.count_nonzero(loading > settings["loading_limit"]))
+
+        return (name, True, iterations, vm[k_min], k_min, vm[k_max], k_max, loading[b_max], b_max,
+                voltage_violations, overloads)
+    finally:
+        for branch in names:
+            circuit.restore(branch)
+
+
+class ContingencyAnalysis:
+
+    def __init__(self, circuit: Circuit, tolerance: float = 0.001, max_iterations: int = 20, method: str = "nr",
+                 variant: str = "XB", v_min: float = 0.95, v_max: float = 1.05, loading_limit: float = 100,
+                 workers: int = None, chunk_size: int = None):
+        self.circuit = circuit
+        self.settings = {"tolerance": tolerance, "max_iterations": max_iterations, "method": method, "variant": variant,
+                         "v_min": v_min, "v_max": v_max, "loading_limit": loading_limit}
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.chunk_size = chunk_size  # contingencies per task, by default about four tasks per worker
+        self.base_state = None
+        self.results = None
+        self.screening = None
+
+    def solve_base_case(self):
+        solution = Solution(self.circuit)
+        converged = solution.power_flow(tolerance=self.settings["tolerance"], method=self.settings["method"],
+                                        variant=self.settings["variant"], verbose=False)
+        if not converged:
+            raise ValueError("The base case power flow did not converge.")
+
+        self.base_state = (solution.voltages.copy(), solution.angles.copy())
+        return solution
+
+    def run(self, branches=None):
+        # N-1 over the given branch names (every in-service line and transformer if None)
+        # returns column arrays, one entry per contingency
+
+        if branches is None:
+            branches = self.calc_in_service_branches()
+        branches = list(branches)
+        for name in branches:
+            for branch in ((name,) if isinstance(name, str) else name):
+                if branch not in self.circuit.transmissionlines and branch not in self.circuit.transformers:
+                    raise ValueError(f"Branch '{branch}' not found.")
+
+        if self.base_state is None:
+            self.solve_base_case()
+
+        if self.workers <= 1 or len(branches) <= 1:
+            solution = Solution(self.circuit)
+            rows = [run_contingency(solution, name, self.base_state, self.settings) for name in branches]
+        else:
+            workers = min(self.workers, len(branches))
+            chunk_size = self.chunk_size or max(1, len(branches) // (4 * workers))
+            chunks = [branches[i:i + chunk_size] for i in range(0, len(branches), chunk_size)]
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                     initargs=(self.circuit, self.base_state, self.settings)) as pool:
+                rows = [row for chunk_rows in pool.map(run_contingencies, chunks) for row in chunk_rows]
+
+        bus_names = list(self.circuit.buses.keys())
+        branch_names = self.circuit.branch_names
+        columns = list(zip(*rows)) if rows else [()] * 11
+
+        self.results = {
+            "branch": list(columns[0]),
+            "converged": np.array(columns[1], dtype=bool),
+            "iterations": np.array(columns[2], dtype=np.int64),
+            "v_min": np.array(columns[3], dtype=float),  # [p.u.]
+            "v_min_bus": [bus_names[k] if k >= 0 else None for k in columns[4]],
+            "v_max": np.array(columns[5], dtype=float),
+            "v_max_bus": [bus_names[k] if k >= 0 else None for k in columns[6]],
+            "max_loading": np.array(columns[7], dtype=float),  # [%]
+            "max_loading_branch": [branch_names[b] if b >= 0 else None for b in columns[8]],
+            "voltage_violations": np.array(columns[9], dtype=np.int64),  # buses outside [v_min, v_max]
+            "overloads": np.array(columns[10], dtype=np.int64),  # branches above loading_limit
+        }
+        return self.results
+
+    def calc_in_service_branches(self):
+        return [name for name, branch in list(self.circuit.transmissionlines.items()) + list(self.circuit.transformers.items())
+                if branch.in_service]
+
+    def screen(self, outages=None, double_outages=(), margin=0.9, block_size=256):
+        # linear (DC) estimate of the post-outage loading of every branch from LODFs, no power flow is solved
+        # outages are single branch names (all in-service branches if None), double_outages are (name, name) pairs
+        # an outage is flagged when its estimated worst loading exceeds margin x loading_limit or it islands the network,
+        # only the flagged ones need the AC run: study.run(study.screening["flagged"])
+
+        circuit = self.circuit
+        outages = self.calc_in_service_branches() if outages is None else list(outages)
+        double_outages = [tuple(pair) for pair in double_outages]
+
+        _, flows = Solution(circuit).dc_power_flow()  # [MW] base-case flows
+        ratings = circuit.calc_branch_ratings()
+        branch_names = circuit.branch_names
+        limit = self.settings["loading_limit"] * margin
+
+        max_loading = []
+        worst_branch = []
+        islanding = []
+
+        # single outages: F_post = F + LODF[:, m] F_m, a block of outage columns at a time
+        for start in range(0, len(outages), block_size):
+            block = outages[start:start + block_size]
+            m = circuit.calc_branch_positions(block)
+            lodf = circuit.calc_lodf(outages=block)
+            loading = np.abs(flows[:, np.newaxis] + lodf * flows[m]) / ratings[:, np.newaxis] * 100
+            islands = np.isnan(lodf).any(axis=0)
+            loading[:, islands] = 0
+            max_loading.extend(np.where(islands, np.nan, loading.max(axis=0)))
+            worst_branch.extend(None if island else branch_names[b] for b, island in zip(loading.argmax(axis=0), islands))
+            islanding.extend(islands)
+
+        # double outages: the flows the two branches carried are redistributed together,
+        # [f_m, f_n] = [[1, -LODF_mn], [-LODF_nm, 1]]^-1 [F_m, F_n],  F_post = F + LODF[:, m] f_m + LODF[:, n] f_n
+        if double_outages:
+            pair_branches = list(dict.fromkeys(name for pair in double_outages for name in pair))
+            column = {name: j for j, name in enumerate(pair_branches)}
+            lodf = circuit.calc_lodf(outages=pair_branches)
+            positions = circuit.calc_branch_positions(pair_branches)
+
+            jm = np.array([column[m] for m, _ in double_outages], dtype=np.int64)
+            jn = np.array([column[n] for _, n in double_outages], dtype=np.int64)
+            pm, pn = positions[jm], positions[jn]
+
+            l_mn, l_nm = lodf[pm, jn], lodf[pn, jm]
+            det = 1 - l_mn * l_nm
+            islands = np.isnan(l_mn) | np.isnan(l_nm) | (np.abs(det) < 1e-8)
+            det = np.where(islands, 1, det)
+            f_m = (flows[pm] + l_mn * flows[pn]) / det
+            f_n = (flows[pn] + l_nm * flows[pm]) / det
+
+            post = flows[:, np.newaxis] + lodf[:, jm] * f_m + lodf[:, jn] * f_n
+            post[pm, np.arange(len(pm))] = 0
+            post[pn, np.arange(len(pn))] = 0
+            loading = np.nan_to_num(np.abs(post)) / ratings[:, np.newaxis] * 100
+            max_loading.extend(np.where(islands, np.nan, loading.max(axis=0)))
+            worst_branch.extend(None if island else branch_names[b] for b, island in zip(loading.argmax(axis=0), islands))
+            islanding.extend(islands)
+
+        all_outages = outages + double_outages
+        max_loading = np.array(max_loading, dtype=float)
+        islanding = np.array(islanding, dtype=bool)
+        flagged = islanding | (np.nan_to_num(max_loading) > limit)
+
+        self.screening = {
+            "outage": all_outages,
+            "max_loading": max_loading,  # [%] DC estimate, NaN for islanding outages
+            "worst_branch": worst_branch,
+            "islanding": islanding,
+            "flagged": [outage for outage, flag in zip(all_outages, flagged) if flag],
+        }
+        return self.screening
+
+    def print_results(self):
+        if self.results is None:
+            print("No contingency results available.")
+            return
+
+        print(f"{'Outage':<12}{'Conv':>6}{'Iter':>6}{'Vmin':>9}{'Vmax':>9}{'Loading %':>11}  Worst branch")
+        r = self.results
+        for i, name in enumerate(r["branch"]):
+            name = name if isinstance(name, str) else "+".join(name)
+            if not r["converged"][i]:
+                print(f"{name:<12}{'no':>6}{r['iterations'][i]:>6}")
+                continue
+            print(f"{name:<12}{'yes':>6}{r['iterations'][i]:>6}{r['v_min'][i]:>9.4f}{r['v_max'][i]:>9.4f}"
+                  f"{r['max_loading'][i]:>11.2f}  {r['max_loading_branch'][i]}")
+
+
+if __name__ == "__main__":
+    circuit1 = build_example_circuit()
+
+    study = ContingencyAnalysis(circuit1, workers=2)
+    screening = study.screen(double_outages=[("Line1", "Line2"), ("Line5", "Line6")])
+    print("Flagged by the LODF screening:", screening["flagged"])
+    study.run(screening["flagged"])
+    study.print_results()
@@ -0,0 +1,190 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+import numpy as np
+import scipy.sparse as sp
+
+from Circuit import Circuit
+from ExampleCircuit import build_example_circuit
+from Solution import Solution
+from SparseLU import SparseLU, UpdatedFactor
+from SystemSettings import SystemSettings
+
+
+class ContinuationPowerFlow:
+
+    def __init__(self, circuit: Circuit, p_direction=None, q_direction=None):
+        # injections move along S(λ) = S_base + λ d, d in MW and Mvar per bus ordered by bus index
+        # by default d is the base-case injection itself, so λ is the fractional increase of every load and generator
+        self.circuit = circuit
+        self.solution = Solution(circuit)
+
+        p_base, q_base = circuit.power_specified
+        p_direction = p_base * SystemSettings.Sbase if p_direction is None else p_direction
+        q_direction = q_base * SystemSettings.Sbase if q_direction is None else q_direction
+        self.p_direction = np.asarray(p_direction, dtype=float) / SystemSettings.Sbase
+        self.q_direction = np.asarray(q_direction, dtype=float) / SystemSettings.Sbase
+        if self.p_direction.shape != (len(circuit.buses),) or self.q_direction.shape != self.p_direction.shape:
+            raise ValueError("The direction needs one entry per bus.")
+
+        self.lu = SparseLU()  # one ordering for every augmented Jacobian of the curve
+        self.results = None
+
+    def calc_direction(self, loads=None, generators=None):
+        # direction that grows the given loads (at their power factor) and generators by their base values,
+        # every load and generator if both are None
+        circuit = self.circuit
+        if loads is None and generators is None:
+            loads, generators = list(circuit.loads), list(circuit.generators)
+        p = np.zeros(len(circuit.buses))
+        q = np.zeros(len(circuit.buses))
+        for name in loads or ():
+            load = circuit.loads[name]
+            p[load.bus.index] -= load.real_power
+            q[load.bus.index] -= load.reactive_power
+        for name in generators or ():
+            generator = circuit.generators[name]
+            p[generator.bus.index] += generator.mw_setpoint
+        return p, q
+
+    def calc_mismatch(self, y, lam):
+        # G(x, λ) = S_calc(x) - S_base - λ d on the non-slack P and PQ Q equations, y = [δ, |V|, λ]
+        self.set_state(y)
+        P, Q = self.solution.compute_power_injection()
+        p_base, q_base = self.circuit.power_specified
+        pv_pq, pq = self.circuit.pv_pq_idx, self.circuit.pq_idx
+        return np.concatenate((P[pv_pq] - p_base[pv_pq] - lam * self.p_direction[pv_pq],
+                               Q[pq] - q_base[pq] - lam * self.q_direction[pq]))
+
+    def calc_bordered(self, y):
+        # [J, -d], the Jacobian bordered by the direction column
+        self.set_state(y)
+        J = self.solution.jacobian.calc_jacobian()
+        d = np.concatenate((self.p_direction[self.circuit.pv_pq_idx], self.q_direction[self.circuit.pq_idx]))
+        return sp.hstack((J, sp.csr_matrix(-d[:, np.newaxis])), format="csr")
+
+    def calc_augmented(self, bordered, k):
+        # [[J, -d], [e_k, 0]], the last row fixes the continuation parameter y_k
+        row = sp.csr_matrix(([1.0], ([0], [k])), shape=(1, bordered.shape[1]))
+        return sp.vstack((bordered, row), format="csc")
+
+    def set_state(self, y):
+        npv_pq = len(self.circuit.pv_pq_idx)
+        self.solution.angles[self.circuit.pv_pq_idx] = y[:npv_pq]
+        self.solution.voltages[self.circuit.pq_idx] = y[npv_pq:-1]
+
+    def run(self, step: float = 0.1, min_step: float = 1e-4, max_step: float = 1.0, max_steps: int = 200,
+            tolerance: float = 1e-6, max_corrections: int = 10, stop_fraction: float = 0.8):
+        # traces the P-V curve from the base case past the nose, y = [δ, |V|, λ]
+        # predictor: tangent of the curve, corrector: Newton with the fastest-changing component of y held fixed
+        # (local parameterization, λ at first, a voltage near the nose)
+        # every point costs one factorization: the augmented Jacobian at the point gives the tangent, and after the
+        # switch of the fixed component (a one-row change, Sherman-Morrison-Woodbury) it serves all corrector iterations
+        # the step grows after quick corrections and halves after failed ones
+        # stops once λ has fallen back below stop_fraction of its maximum, or the step gets too small
+
+        solution = self.solution
+        if not solution.power_flow(tolerance=tolerance, init="flat", verbose=False):
+            raise ValueError("The base case power flow did not converge.")
+
+        pv_pq, pq = self.circuit.pv_pq_idx, self.circuit.pq_idx
+        y = np.concatenate((solution.angles[pv_pq], solution.voltages[pq], [0.0]))
+        n = len(y)
+
+        lambdas = [0.0]
+        voltages = [solution.voltages.copy()]
+        angles = [solution.angles.copy()]
+        corrections = [0]
+        k, direction = n - 1, 1.0  # λ is the first continuation parameter and it grows
+        lambda_max, nose = 0.0, 0
+
+        factorizations = self.lu.factorizations
+        for _ in range(max_steps):
+            bordered = self.calc_bordered(y)
+            matrix = self.calc_augmented(bordered, k)
+            factor = self.lu.factorize(matrix)
+
+            # predictor: tangent with its k-th component at ±1, normalized
+            rhs = np.zeros(n)
+            rhs[-1] = direction
+            tangent = factor.solve(rhs)
+            tangent /= np.linalg.norm(tangent)
+
+            # next parameter is the fastest-changing component, keeping the direction of travel
+            k_next = int(np.argmax(np.abs(tangent)))
+            direction = np.sign(tangent[k_next])
+            if k_next != k:
+                try:
+                    factor = UpdatedFactor(factor, matrix, self.calc_augmented(bordered, k_next))
+                except np.linalg.LinAlgError:
+                    factor = self.lu.factorize(self.calc_augmented(bordered, k_next))
+                k = k_next
+
+            y_new = None
+            while step >= min_step:
+                y_new, iterations = self.correct(factor, y + step * tangent, k, tolerance, max_corrections)
+                if y_new is not None:
+                    break
+                step /= 2
+            if y_new is None:
+                break
+
+            y = y_new
+            if iterations <= 4:
+                step = min(step * 1.5, max_step)
+
+            lam = y[-1]
+            lambdas.append(lam)
+            voltages.append(solution.voltages.copy())
+            angles.append(solution.angles.copy())
+            corrections.append(iterations)
+
+            if lam > lambda_max:
+                lambda_max, nose = lam, len(lambdas) - 1
+            elif lam < stop_fraction * lambda_max:
+                break
+
+        self.set_state(y)
+        self.results = {
+            "lambda": np.array(lambdas),  # load/generation multiplier along the direction
+            "voltages": np.array(voltages),  # (points x buses) [p.u.]
+            "angles": np.array(angles),  # (points x buses) [rad]
+            "corrections": np.array(corrections),  # corrector iterations per point
+            "lambda_max": lambda_max,  # loadability limit
+            "nose": nose,  # index of the point with the largest λ
+            "factorizations": self.lu.factorizations - factorizations,
+        }
+        return self.results
+
+    def correct(self, factor, y_pred, k, tolerance, max_corrections):
+        # Newton on [G(y); y_k - y_pred_k] = 0 with the factors of the last point, None if it does not converge
+        y = y_pred.copy()
+        npv_pq = len(self.circuit.pv_pq_idx)
+        for i in range(max_corrections + 1):
+            mismatch = self.calc_mismatch(y, y[-1])
+            if not np.all(np.isfinite(mismatch)):
+                return None, i
+            if np.max(np.abs(mismatch)) < tolerance:
+                return y, i
+            if i == max_corrections:
+                break
+            rhs = np.concatenate((-mismatch, [y_pred[k] - y[k]]))
+            y += factor.solve(rhs)
+            if np.any(y[npv_pq:-1] <= 0):
+                return None, i
+        return None, max_corrections
+
+
+if __name__ == "__main__":
+    circuit1 = build_example_circuit()
+
+    # every load and generator grows along its base value
+    cpf = ContinuationPowerFlow(circuit1)
+    results = cpf.run()
+
+    bus3 = circuit1.bus_index["Bus3"]
+    for lam, v, iterations in zip(results["lambda"], results["voltages"][:, bus3], results["corrections"]):
+        print(f"λ = {lam:.4f}: V(Bus3) = {v:.4f} p.u. ({iterations} corrections)")
+    print(f"Loadability limit: {1 + results['lambda_max']:.3f} x base load, "
+          f"{results['factorizations']} factorizations")
@@ -0,0 +1,79 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+import numpy as np
+
+
+class DeviceTable:
+
+    def __init__(self, dtype, capacity: int = 16):
+        self.dtype = np.dtype(dtype)
+        self._records = np.zeros(max(capacity, 1), dtype=self.dtype)  # preallocated rows, doubled when full
+        self.size = 0
+        self.version = 0  # bumped by every write, lets the circuit tell when cached sums are stale
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def data(self):
+        # filled rows only, a view so column writes go straight into the table
+        return self._records[:self.size]
+
+    def append(self, **fields):
+        # add one record and return its row number
+
+        if self.size == len(self._records):
+            grown = np.zeros(2 * len(self._records), dtype=self.dtype)
+            grown[:self.size] = self._records[:self.size]
+            self._records = grown
+
+        row = self.size
+        for field, value in fields.items():
+            self._records[field][row] = value
+        self.size += 1
+        self.version += 1
+
+        return row
+
+    def extend(self, count: int, **columns):
+        # add count records from whole columns in one write and return their row numbers, e.g. an imported case
+
+        if self.size + count > len(self._records):
+            capacity = len(self._records)
+            while capacity < self.size + count:
+                capacity *= 2
+            grown = np.zeros(capacity, dtype=self.dtype)
+            grown[:self.size] = self._records[:self.size]
+            self._records = grown
+
+        for field, values in columns.items():
+            self._records[field][self.size:self.size + count] = values
+        rows = np.arange(self.size, self.size + count)
+        self.size += count
+        self.version += 1
+
+        return rows
+
+    def get(self, field: str, row: int):
+        return self._records[field][row]
+
+    def set(self, field: str, row: int, value):
+        self._records[field][row] = value
+        self.version += 1
+
+    def set_rows(self, field: str, rows, values):
+        # one field of many rows in a single write, e.g. a timestep of a load profile
+        self._records[field][np.asarray(rows)] = values
+        self.version += 1
+
+
+if __name__ == "__main__":
+    table = DeviceTable([("bus", np.int64), ("p_mw", np.float64)], capacity=2)
+
+    for i in range(5):
+        table.append(bus=i, p_mw=10.0 * i)
+
+    print(len(table), table.data)
+    print(table.data["p_mw"].sum())
@@ -0,0 +1,47 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+from Circuit import Circuit
+
+
+def build_example_circuit(name: str = "Test Circuit"):
+    # the 7-bus course example of main.py, shared by the __main__ demos of the study modules
+    circuit1 = Circuit(name)
+
+    circuit1.add_bus("Bus1", 20)
+    circuit1.add_bus("Bus2", 230)
+    circuit1.add_bus("Bus3", 230)
+    circuit1.add_bus("Bus4", 230)
+    circuit1.add_bus("Bus5", 230)
+    circuit1.add_bus("Bus6", 230)
+    circuit1.add_bus("Bus7", 18)
+
+    circuit1.add_conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+    circuit1.add_bundle("Bundle1", 2, 1.5, "Partridge")
+    circuit1.add_geometry("Geometry1", 0, 0, 18.5, 0, 37, 0)
+
+    circuit1.add_tline("Line1", "Bus2", "Bus4", "Bundle1", "Geometry1", 10)
+    circuit1.add_tline("Line2", "Bus2", "Bus3", "Bundle1", "Geometry1", 25)
+    circuit1.add_tline("Line3", "Bus3", "Bus5", "Bundle1", "Geometry1", 20)
+    circuit1.add_tline("Line4", "Bus4", "Bus6", "Bundle1", "Geometry1", 20)
+    circuit1.add_tline("Line5", "Bus5", "Bus6", "Bundle1", "Geometry1", 10)
+    circuit1.add_tline("Line6", "Bus4", "Bus5", "Bundle1", "Geometry1", 35)
+
+    circuit1.add_transformer("T1", "Bus1", "Bus2", 125, 8.5, 10, "delta-y", 1)
+    circuit1.add_transformer("T2", "Bus6", "Bus7", 200, 10.5, 12, "delta-y", 999999)
+
+    circuit1.add_generator("G1", "Bus1", 20, 100, 0, True)
+    circuit1.add_generator("G2", "Bus7", 18, 200, 1, True)
+
+    circuit1.add_load("L1", "Bus3", 110, 50)
+    circuit1.add_load("L2", "Bus4", 100, 70)
+    circuit1.add_load("L3", "Bus5", 100, 65)
+
+    return circuit1
+
+
+if __name__ == "__main__":
+    circuit1 = build_example_circuit()
+    print(f"{circuit1.name}: {len(circuit1.buses)} buses, {len(circuit1.transmissionlines)} lines, "
+          f"{len(circuit1.transformers)} transformers, {len(circuit1.generators)} generators, {len(circuit1.loads)} loads")
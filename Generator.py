@@ -4,15 +4,21 @@
 
 from Bus import Bus
 from SystemSettings import SystemSettings
+from DeviceTable import DeviceTable
+import numpy as np
 import pandas as pd
 
 class Generator:
 
-    def __init__(self,name: str, bus: Bus, voltage_setpoint: float, mw_setpoint: float, grounding_impedance: float, is_grounded: bool = True):
+    # one record per generator in the circuit generator table
+    table_dtype = [("bus", np.int64), ("voltage_setpoint", np.float64), ("mw_setpoint", np.float64),
+                   ("y1", np.complex128), ("y2", np.complex128), ("y0", np.complex128)]
+
+    def __init__(self,name: str, bus: Bus, voltage_setpoint: float, mw_setpoint: float, grounding_impedance: float, is_grounded: bool = True,
+                 table: DeviceTable = None, row: int = None):
         self.name = name
         self.bus = bus
         self.voltage_setpoint = voltage_setpoint
-        self.mw_setpoint = mw_setpoint
 
         # sequence reactances
         self.x1 = 0.12 # positive-sequence subtransient reactance
@@ -23,25 +29,37 @@ class Generator:
         self.Zn = grounding_impedance #default of zero which represents a solid ground - NEED TO MAKE IN PU
         self.is_grounded = is_grounded
 
-    def y_prim_positive_sequence(self):
+        # a row already written by Circuit.add_generators
+        if row is not None:
+            self.table = table
+            self.row = row
+            return
+
+        # the generator is stored as a row of the circuit generator table
+        self.table = table if table is not None else DeviceTable(Generator.table_dtype, capacity=1)
+        self.row = self.table.append(bus=-1 if bus.index is None else bus.index,
+                                     voltage_setpoint=voltage_setpoint, mw_setpoint=mw_setpoint,
+                                     y1=self.calc_y_positive_sequence(),
+                                     y2=self.calc_y_negative_sequence(),
+                                     y0=self.calc_y_zero_sequence())
+
+    @property
+    def mw_setpoint(self):
+        return float(self.table.get("mw_setpoint", self.row))
+
+    @mw_setpoint.setter
+    def mw_setpoint(self, value: float):
+        self.table.set("mw_setpoint", self.row, value)
+
+    def calc_y_positive_sequence(self) -> complex:
         # primitive admittance (Y = 1 / jX1) for the positive-sequence network
+        return 1 / (1j * self.x1)
 
-        Y = 1 / (1j * self.x1)
-
-        Yprim1 = pd.DataFrame([[Y]], index=[self.bus.name], columns=[self.bus.name])
-
-        return Yprim1
+    def calc_y_negative_sequence(self) -> complex:
+        # primitive admittance (Y = 1 / jX2) for the negative-sequence network.
+        return 1 / (1j * self.x2)
 
-    def y_prim_negative_sequence(self) -> complex:
-            # primitive admittance (Y = 1 / jX2) for the negative-sequence network.
-
-            Y = 1 / (1j * self.x2)
-
-            Yprim2 = pd.DataFrame([[Y]], index=[self.bus.name], columns=[self.bus.name])
-
-            return Yprim2
-
-    def y_prim_zero_sequence(self) -> complex:
+    def calc_y_zero_sequence(self) -> complex:
         # primitive admittance (Y = 1 / (jX0 + 3*Zn)) for the zero-sequence network.
         # if generator is ungrounded, return 0
 
@@ -52,6 +70,25 @@ class Generator:
         if not self.is_grounded:
             Y = 0 + 0j
 
+        return Y
+
+    def y_prim_positive_sequence(self):
+        Y = self.table.get("y1", self.row)
+
+        Yprim1 = pd.DataFrame([[Y]], index=[self.bus.name], columns=[self.bus.name])
+
+        return Yprim1
+
+    def y_prim_negative_sequence(self):
+        Y = self.table.get("y2", self.row)
+
+        Yprim2 = pd.DataFrame([[Y]], index=[self.bus.name], columns=[self.bus.name])
+
+        return Yprim2
+
+    def y_prim_zero_sequence(self):
+        Y = self.table.get("y0", self.row)
+
         Yprim0 = pd.DataFrame([[Y]], index=[self.bus.name], columns=[self.bus.name])
 
         return Yprim0
@@ -3,119 +3,69 @@
 # Maria Hermann
 
 import numpy as np
-from Solution import Solution
-from Circuit import Circuit
+import scipy.sparse as sp
 
 
 class Jacobian:
     def __init__(self, solution):
         self.solution = solution
-        self.ybus = solution.ybus
-        self.voltages = solution.voltages
-        self.angles = solution.angles
-        self.buses = solution.circuit.buses
-
-    def calc_j1(self, pv_pq_buses, all_bus):
-        sizep = len(pv_pq_buses)
-        J1 = np.zeros((sizep, sizep))
-        for i, bus_i in enumerate(pv_pq_buses):
-            vi = self.voltages[bus_i]
-            delta_i = self.angles[bus_i]
-            y_row = self.ybus.loc[bus_i]
-            for j, bus_j in enumerate(pv_pq_buses):
-                vj = self.voltages[bus_j]
-                delta_j = self.angles[bus_j]
-                yij = y_row[bus_j]
-                theta_ij = np.angle(yij)
-                if i == j:
-                    J1[i, j] = -vi * sum(self.voltages[b] * abs(y_row[b]) * np.sin(delta_i - self.angles[b] - np.angle(y_row[b]))
-                        for b in all_bus if b != bus_i)
-                else:
-                    J1[i, j] = vi * vj * abs(yij) * np.sin(delta_i - delta_j - theta_ij)
-        return J1
-
-    def calc_j2(self, pv_pq_buses, pq_buses, all_bus):
-        sizep = len(pv_pq_buses)
-        sizeq = len(pq_buses)
-        J2 = np.zeros((sizep, sizeq))
-        for i, bus_i in enumerate(pv_pq_buses):
-            vi = self.voltages[bus_i]
-            delta_i = self.angles[bus_i]
-            y_row = self.ybus.loc[bus_i]
-            for j, bus_j in enumerate(pq_buses):
-                vj = self.voltages[bus_j]
-                delta_j = self.angles[bus_j]
-                yij = y_row[bus_j]
-                theta_ij = np.angle(yij)
-                if bus_i == bus_j:
-                    J2[i, j] = sum(
-                        self.voltages[b] * abs(y_row[b]) *
-                        np.cos(delta_i - self.angles[b] - np.angle(y_row[b]))
-                        for b in all_bus) + vi * abs(y_row[bus_i]) * np.cos(np.angle(y_row[bus_i]))
-                else:
-                    J2[i, j] = vi * abs(y_row[bus_j]) * np.cos(delta_i - delta_j - theta_ij)
-        return J2
-
-    def calc_j3(self, pv_pq_buses, pq_buses, all_bus):
-        sizep = len(pv_pq_buses)
-        sizeq = len(pq_buses)
-        J3 = np.zeros((sizeq, sizep))
-        for i, bus_i in enumerate(pv_pq_buses):
-            if bus_i not in pq_buses:
-                continue
-            vi = self.voltages[bus_i]
-            delta_i = self.angles[bus_i]
-            y_row = self.ybus.loc[bus_i]
-            qi_idx = pq_buses.index(bus_i)
-            for j, bus_j in enumerate(pv_pq_buses):
-                vj = self.voltages[bus_j]
-                delta_j = self.angles[bus_j]
-                yij = y_row[bus_j]
-                theta_ij = np.angle(yij)
-                if i == j:
-                    J3[qi_idx, j] = sum(
-                        vi * self.voltages[b] * abs(y_row[b]) *
-                        np.cos(delta_i - self.angles[b] - np.angle(y_row[b]))
-                        for b in all_bus if b != bus_i)
-                else:
-                    J3[qi_idx, j] = -vi * vj * abs(yij) * np.cos(delta_i - delta_j - theta_ij)
-        return J3
-
-    def calc_j4(self, pq_buses, all_bus):
-        sizeq = len(pq_buses)
-        J4 = np.zeros((sizeq, sizeq))
-        for i, bus_i in enumerate(pq_buses):
-            vi = self.voltages[bus_i]
-            delta_i = self.angles[bus_i]
-            y_row = self.ybus.loc[bus_i]
-            for j, bus_j in enumerate(pq_buses):
-                delta_j = self.angles[bus_j]
-                yij = y_row[bus_j]
-                theta_ij = np.angle(yij)
-                if bus_i == bus_j:
-                    J4[i, j] = (sum(self.voltages[b] * abs(y_row[b]) * np.sin(delta_i - self.angles[b] - np.angle(y_row[b])) for b in all_bus)
-                                - vi * abs(y_row[bus_i]) * np.sin(np.angle(y_row[bus_i])))
-                else:
-                    J4[i, j] = vi * abs(y_row[bus_j]) * np.sin(delta_i - delta_j - theta_ij)
-        return J4
-
-    def calc_jacobian(self):
-        bus_list = list(self.buses.keys())
-        pv_pq_buses = [b for b in bus_list if self.buses[b].bus_type in ["PV Bus", "PQ Bus"]]
-        pq_buses = [b for b in bus_list if self.buses[b].bus_type == "PQ Bus"]
-        all_bus = bus_list
-
-        J1 = self.calc_j1(pv_pq_buses, all_bus)
-        J2 = self.calc_j2(pv_pq_buses, pq_buses, all_bus)
-        J3 = self.calc_j3(pv_pq_buses, pq_buses, all_bus)
-        J4 = self.calc_j4(pq_buses, all_bus)
-
-        J = np.vstack((np.hstack((J1, J2)), np.hstack((J3, J4))))
+        self.circuit = solution.circuit
+
+    def calc_partials(self, voltages=None, angles=None):
+        # dS/dδ and dS/d|V| of every bus injection, S = V * conj(Ybus V), with the sparsity of Ybus
+        # at the solution's present state unless voltages and angles are given
+        ybus = self.circuit.ybus_sparse.matrix
+        if voltages is None:
+            voltages, angles = self.solution.voltages, self.solution.angles
+        V = voltages * np.exp(1j * angles)
+        Ibus = ybus @ V
+
+        diag_V = sp.diags(V)
+        diag_I = sp.diags(Ibus)
+        diag_V_norm = sp.diags(V / np.abs(V))
+
+        dS_ddelta = 1j * diag_V @ (diag_I - ybus @ diag_V).conj()
+        dS_dV = diag_V @ (ybus @ diag_V_norm).conj() + diag_I.conj() @ diag_V_norm
+
+        return dS_ddelta.tocsr(), dS_dV.tocsr()
+
+    def calc_j1(self, dS_ddelta, pv_pq_buses):
+        # ∂P/∂δ
+        return dS_ddelta.real[pv_pq_buses][:, pv_pq_buses]
+
+    def calc_j2(self, dS_dV, pv_pq_buses, pq_buses):
+        # ∂P/∂V
+        return dS_dV.real[pv_pq_buses][:, pq_buses]
+
+    def calc_j3(self, dS_ddelta, pv_pq_buses, pq_buses):
+        # ∂Q/∂δ
+        return dS_ddelta.imag[pq_buses][:, pv_pq_buses]
+
+    def calc_j4(self, dS_dV, pq_buses):
+        # ∂Q/∂V
+        return dS_dV.imag[pq_buses][:, pq_buses]
+
+    def calc_jacobian(self, voltages=None, angles=None):
+        # bus lists hold bus indices, not names
+        pv_pq_buses = self.circuit.pv_pq_idx
+        pq_buses = self.circuit.pq_idx
+
+        dS_ddelta, dS_dV = self.calc_partials(voltages, angles)
+
+        J1 = self.calc_j1(dS_ddelta, pv_pq_buses)
+        J2 = self.calc_j2(dS_dV, pv_pq_buses, pq_buses)
+        J3 = self.calc_j3(dS_ddelta, pv_pq_buses, pq_buses)
+        J4 = self.calc_j4(dS_dV, pq_buses)
+
+        J = sp.bmat([[J1, J2], [J3, J4]], format="csr")
 
         return J
 
 
 if __name__ == "__main__":
+    from Solution import Solution
+    from Circuit import Circuit
+
     # create test circuit
     circuit1 = Circuit("Test Circuit")
 
@@ -179,7 +129,7 @@ if __name__ == "__main__":
 
 
     jacobian = Jacobian(solution)
-    J = jacobian.calc_jacobian()
+    J = jacobian.calc_jacobian().toarray()
 
     # Extract the bus lists needed for labeling
     bus_list = list(circuit1.buses.keys())
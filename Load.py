@@ -4,22 +4,65 @@
 
 from Bus import Bus
 from SystemSettings import SystemSettings
+from DeviceTable import DeviceTable
+import numpy as np
 import pandas as pd
 
 class Load:
 
-    def __init__(self, name: str, bus: Bus, real_power: float, reactive_power: float):
+    # one record per load in the circuit load table
+    table_dtype = [("bus", np.int64), ("real_power", np.float64), ("reactive_power", np.float64),
+                   ("y", np.complex128)]
+
+    def __init__(self, name: str, bus: Bus, real_power: float, reactive_power: float, table: DeviceTable = None,
+                 row: int = None):
         self.name = name
         self.bus = bus
-        self.real_power = real_power #MW
-        self.reactive_power = reactive_power #MVAR
 
         self.rated_voltage = bus.base_kv # in kV
-        self.admittance = (self.real_power - 1j*self.reactive_power)/ (self.rated_voltage**2) # Not in per unit
-
         self.ybase = SystemSettings.Sbase / self.rated_voltage**2
 
-        self.y_pu = self.admittance / self.ybase # in per unit
+        # a row already written by Circuit.add_loads
+        if row is not None:
+            self.table = table
+            self.row = row
+            self.admittance = self.y_pu * self.ybase
+            return
+
+        self.admittance = (real_power - 1j*reactive_power)/ (self.rated_voltage**2) # Not in per unit
+
+        # the load is stored as a row of the circuit load table
+        self.table = table if table is not None else DeviceTable(Load.table_dtype, capacity=1)
+        self.row = self.table.append(bus=-1 if bus.index is None else bus.index,
+                                     real_power=real_power, reactive_power=reactive_power,
+                                     y=self.admittance / self.ybase)
+
+    @property
+    def real_power(self):
+        return float(self.table.get("real_power", self.row)) #MW
+
+    @real_power.setter
+    def real_power(self, value: float):
+        self.table.set("real_power", self.row, value)
+        self.update_admittance()
+
+    @property
+    def reactive_power(self):
+        return float(self.table.get("reactive_power", self.row)) #MVAR
+
+    @reactive_power.setter
+    def reactive_power(self, value: float):
+        self.table.set("reactive_power", self.row, value)
+        self.update_admittance()
+
+    def update_admittance(self):
+        # the sequence networks model the load as a constant admittance, it follows every P/Q change
+        self.admittance = (self.real_power - 1j*self.reactive_power) / (self.rated_voltage**2)
+        self.table.set("y", self.row, self.admittance / self.ybase)
+
+    @property
+    def y_pu(self):
+        return complex(self.table.get("y", self.row)) # in per unit
 
     def y_prim(self):
         # primitive admittance (Y = 1 / jX1) for the positive-sequence network
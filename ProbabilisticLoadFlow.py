@@ -0,0 +1,212 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.special import ndtr
+
+from Circuit import Circuit
+from ExampleCircuit import build_example_circuit
+from BatchPowerFlow import BatchPowerFlow
+from SystemSettings import SystemSettings
+
+
+class StreamingStats:
+
+    # running mean, variance and histogram quantiles of n quantities, memory does not grow with the sample count
+
+    def __init__(self, n: int, low: float, high: float, bins: int = 1000):
+        self.count = 0
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)  # sum of squared deviations from the mean
+        self.low, self.high, self.bins = low, high, bins
+        self.width = (high - low) / bins
+        self.histogram = np.zeros((n, bins), dtype=np.int64)  # values outside [low, high] fall into the end bins
+        self.minimum = np.full(n, np.inf)
+        self.maximum = np.full(n, -np.inf)
+
+    def update(self, batch):
+        # adds a (samples x n) batch, mean and variance are merged with Chan's parallel update
+        batch = np.atleast_2d(batch)
+        nb = batch.shape[0]
+        if nb == 0:
+            return
+
+        batch_mean = batch.mean(axis=0)
+        batch_m2 = ((batch - batch_mean) ** 2).sum(axis=0)
+        delta = batch_mean - self.mean
+        total = self.count + nb
+        self.mean += delta * nb / total
+        self.m2 += batch_m2 + delta ** 2 * self.count * nb / total
+        self.count = total
+
+        self.minimum = np.minimum(self.minimum, batch.min(axis=0))
+        self.maximum = np.maximum(self.maximum, batch.max(axis=0))
+
+        bins = np.clip(((batch - self.low) / self.width).astype(np.int64), 0, self.bins - 1)
+        n = batch.shape[1]
+        flat = (np.arange(n)[np.newaxis, :] * self.bins + bins).ravel()
+        self.histogram += np.bincount(flat, minlength=n * self.bins).reshape(n, self.bins)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else np.zeros_like(self.m2)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def quantiles(self, q):
+        # (len(q) x n) quantiles, linear within a histogram bin
+        q = np.atleast_1d(q)
+        cdf = np.cumsum(self.histogram, axis=1)
+        rows = np.arange(cdf.shape[0])
+        result = np.zeros((len(q), cdf.shape[0]))
+
+        for k, quantile in enumerate(q):
+            target = quantile * self.count
+            idx = np.argmax(cdf >= target, axis=1)
+            below = np.where(idx > 0, cdf[rows, idx - 1], 0)
+            in_bin = self.histogram[rows, idx]
+            fraction = np.where(in_bin > 0, (target - below) / np.maximum(in_bin, 1), 0)
+            result[k] = np.clip(self.low + (idx + fraction) * self.width, self.minimum, self.maximum)
+
+        return result
+
+
+class ProbabilisticLoadFlow:
+
+    def __init__(self, circuit: Circuit, loads=None, generators=None, correlation=None, seed=None):
+        # loads: load name -> MW spread of its real power, Q follows at the load's base power factor
+        # generators: generator name -> MW spread of its setpoint
+        # a spread is a standard deviation around the base value or a tuple ("normal", mean, std) / ("uniform", low, high)
+        # correlation: correlation matrix of the sampled quantities, loads first then generators (Gaussian copula)
+        self.circuit = circuit
+        self.rng = np.random.default_rng(seed)
+
+        loads = loads or {}
+        generators = generators or {}
+        for name in loads:
+            if name not in circuit.loads:
+                raise ValueError(f"Load '{name}' not found.")
+        for name in generators:
+            if name not in circuit.generators:
+                raise ValueError(f"Generator '{name}' not found.")
+
+        self.load_names = list(loads)
+        self.generator_names = list(generators)
+        specs = ([(circuit.loads[name].real_power, spec) for name, spec in loads.items()]
+                 + [(circuit.generators[name].mw_setpoint, spec) for name, spec in generators.items()])
+
+        # (kind, a, b) per sampled quantity, kind 0 normal (mean, std), 1 uniform (low, high)
+        self.kind = np.zeros(len(specs), dtype=np.int8)
+        self.a = np.zeros(len(specs))
+        self.b = np.zeros(len(specs))
+        for k, (base, spec) in enumerate(specs):
+            if np.isscalar(spec):
+                spec = ("normal", base, spec)
+            if spec[0] not in ("normal", "uniform"):
+                raise ValueError(f"Invalid distribution: {spec[0]}")
+            self.kind[k] = 0 if spec[0] == "normal" else 1
+            self.a[k], self.b[k] = spec[1], spec[2]
+
+        self.cholesky = None
+        if correlation is not None:
+            correlation = np.asarray(correlation, dtype=float)
+            if correlation.shape != (len(specs), len(specs)):
+                raise ValueError("The correlation matrix needs one row and column per sampled load and generator.")
+            self.cholesky = np.linalg.cholesky(correlation)
+
+        # sampled MW enter the bus injections through sparse (buses x quantities) incidence matrices
+        N = len(circuit.buses)
+        bus = np.array([circuit.loads[name].bus.index for name in self.load_names]
+                       + [circuit.generators[name].bus.index for name in self.generator_names], dtype=np.int64)
+        q_ratio = [-(load.reactive_power / load.real_power if load.real_power != 0 else 0)
+                   for load in (circuit.loads[name] for name in self.load_names)]
+        quantity = np.arange(len(specs))
+        self.p_incidence = sp.csr_matrix((np.concatenate((-np.ones(len(self.load_names)), np.ones(len(self.generator_names)))),
+                                          (bus, quantity)), shape=(N, len(specs)))
+        self.q_incidence = sp.csr_matrix((np.concatenate((q_ratio, np.zeros(len(self.generator_names)))), (bus, quantity)),
+                                         shape=(N, len(specs)))
+
+        base = np.array([base for base, _ in specs])
+        p_base, q_base = circuit.power_specified
+        self.p_fixed = p_base * SystemSettings.Sbase - self.p_incidence @ base  # injections of everything not sampled
+        self.q_fixed = q_base * SystemSettings.Sbase - self.q_incidence @ base
+
+        self.results = None
+
+    def sample(self, n: int):
+        # (n x quantities) MW samples, correlated through the Gaussian copula
+        z = self.rng.standard_normal((n, len(self.kind)))
+        if self.cholesky is not None:
+            z = z @ self.cholesky.T
+        normal = self.a + self.b * z
+        uniform = self.a + (self.b - self.a) * ndtr(z)
+        return np.where(self.kind == 0, normal, uniform)
+
+    def run(self, samples: int = 10000, batch_size: int = 500, quantiles=(0.01, 0.05, 0.5, 0.95, 0.99),
+            voltage_range=(0.8, 1.2), loading_range=(0, 200), bins: int = 1000, tolerance: float = 0.001,
+            max_iterations: int = 20):
+        # solves the samples batch by batch and keeps only the running statistics of bus voltages and branch loadings
+        # unconverged samples are counted and left out of the statistics
+
+        circuit = self.circuit
+        batch_solver = BatchPowerFlow(circuit)
+        n_branches = len(circuit.line_table) + len(circuit.transformer_table)
+        voltage_stats = StreamingStats(len(circuit.buses), *voltage_range, bins=bins)
+        loading_stats = StreamingStats(n_branches, *loading_range, bins=bins)
+        unconverged = 0
+
+        for start in range(0, samples, batch_size):
+            x = self.sample(min(batch_size, samples - start))
+            p_injections = self.p_fixed + (self.p_incidence @ x.T).T
+            q_injections = self.q_fixed + (self.q_incidence @ x.T).T
+
+            result = batch_solver.solve(p_injections, q_injections, tolerance=tolerance, max_iterations=max_iterations)
+            ok = result["converged"]
+            unconverged += int(np.count_nonzero(~ok))
+
+            voltages = result["voltages"][ok]
+            V = voltages * np.exp(1j * result["angles"][ok])
+            voltage_stats.update(voltages)
+            loading_stats.update(circuit.calc_branch_flows(V.T)["loading"].T)
+
+        self.results = {
+            "samples": samples,
+            "unconverged": unconverged,
+            "quantiles": np.asarray(quantiles),
+            "buses": list(circuit.buses.keys()),
+            "voltage_mean": voltage_stats.mean,  # [p.u.]
+            "voltage_std": voltage_stats.std,
+            "voltage_min": voltage_stats.minimum,
+            "voltage_max": voltage_stats.maximum,
+            "voltage_quantiles": voltage_stats.quantiles(quantiles),  # (quantiles x buses)
+            "branches": circuit.branch_names,
+            "loading_mean": loading_stats.mean,  # [%]
+            "loading_std": loading_stats.std,
+            "loading_max": loading_stats.maximum,
+            "loading_quantiles": loading_stats.quantiles(quantiles),  # (quantiles x branches)
+        }
+        return self.results
+
+
+if __name__ == "__main__":
+    circuit1 = build_example_circuit()
+
+    # 10 % load spread with correlated loads, G2 output uniform between 150 and 200 MW
+    correlation = np.array([[1.0, 0.6, 0.6, 0.0],
+                            [0.6, 1.0, 0.6, 0.0],
+                            [0.6, 0.6, 1.0, 0.0],
+                            [0.0, 0.0, 0.0, 1.0]])
+    plf = ProbabilisticLoadFlow(circuit1, loads={"L1": 11, "L2": 10, "L3": 10},
+                                generators={"G2": ("uniform", 150, 200)}, correlation=correlation, seed=1)
+    results = plf.run(samples=5000)
+
+    print(f"Unconverged samples: {results['unconverged']} of {results['samples']}")
+    for k, bus in enumerate(results["buses"]):
+        low, high = results["voltage_quantiles"][1, k], results["voltage_quantiles"][3, k]
+        print(f"{bus}: mean {results['voltage_mean'][k]:.4f} p.u., 5-95 % [{low:.4f}, {high:.4f}]")
+    for k, branch in enumerate(results["branches"]):
+        print(f"{branch}: mean loading {results['loading_mean'][k]:.1f} %, 99 % {results['loading_quantiles'][4, k]:.1f} %")
@@ -0,0 +1,227 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+import numpy as np
+
+fault_types = ("3ph", "LG", "LL", "LLG")
+
+a = np.exp(1j * 2 * np.pi / 3)
+A = np.array([[1, 1, 1],
+              [1, a**2, a],
+              [1, a, a**2]])  # [V0, V1, V2] -> [Va, Vb, Vc]
+
+
+def sequence_currents(fault_type, z1, z2, z0, zf, v_prefault):
+    # I0, I1, I2 at the faulted bus from its Thevenin impedances, every argument may be an array
+
+    if fault_type == "3ph":
+        I1 = v_prefault / z1
+        I0 = I2 = np.zeros_like(I1)
+    elif fault_type == "LG":
+        I1 = v_prefault / (z1 + z2 + z0 + 3 * zf)
+        I0 = I2 = I1
+    elif fault_type == "LL":
+        I1 = v_prefault / (z1 + z2 + zf)
+        I2 = -I1
+        I0 = np.zeros_like(I1)
+    elif fault_type == "LLG":
+        z0f = z0 + 3 * zf
+        I1 = v_prefault / (z1 + z2 * z0f / (z2 + z0f))
+        I2 = -I1 * z0f / (z2 + z0f)
+        I0 = -I1 * z2 / (z2 + z0f)
+    else:
+        raise ValueError(f"Invalid fault type: {fault_type}")
+
+    return I0, I1, I2
+
+
+def branch_fault_currents(circuit, voltage_seq):
+    # sequence currents entering every branch at its from and to end, (faults x branches x 3) each
+    # voltage_seq holds the post-fault V0, V1, V2 of every bus, (faults x buses x 3)
+
+    voltage_seq = np.asarray(voltage_seq, dtype=complex)
+    if voltage_seq.shape[-2] != len(circuit.buses):
+        raise ValueError("Branch currents need the post-fault voltages of every bus.")
+
+    n_branches = len(circuit.line_table) + len(circuit.transformer_table)
+    from_seq = np.zeros(voltage_seq.shape[:-2] + (n_branches, 3), dtype=complex)
+    to_seq = np.zeros_like(from_seq)
+    for s, sequence in enumerate(("zero", "pos", "neg")):
+        yf, yt = circuit.branch_admittances(sequence)
+        v = voltage_seq[..., s].reshape(-1, voltage_seq.shape[-2]).T  # (buses x faults)
+        from_seq[..., s] = (yf @ v).T.reshape(from_seq.shape[:-1])
+        to_seq[..., s] = (yt @ v).T.reshape(to_seq.shape[:-1])
+
+    return from_seq, to_seq
+
+
+def short_circuit_sweep(circuit, buses=None, types=fault_types, zf=0, v_prefault=1.0, monitored=None, block_size=256,
+                        branch_currents=False):
+    # every (fault type, fault bus) pair in one pass, faults are ordered type by type and bus by bus
+    # v_prefault is a scalar or one complex voltage per bus, monitored picks the buses of the voltage arrays
+    # branch_currents adds the currents of every line and transformer (see circuit.branch_names), needs all buses monitored
+    # Zbus columns are solved block_size fault buses at a time
+
+    names = list(circuit.buses.keys())
+    buses = names if buses is None else list(buses)
+    monitored = names if monitored is None else list(monitored)
+    for fault_type in types:
+        if fault_type not in fault_types:
+            raise ValueError(f"Invalid fault type: {fault_type}")
+
+    if branch_currents and monitored != names:
+        raise ValueError("Branch currents need every bus monitored.")
+
+    fault_idx = np.array([circuit.bus_index[bus] for bus in buses], dtype=np.int64)
+    mon_idx = np.array([circuit.bus_index[bus] for bus in monitored], dtype=np.int64)
+
+    v_prefault = np.broadcast_to(np.asarray(v_prefault, dtype=complex), (len(names),))
+
+    # sequences each fault type draws on, 0 zero, 1 positive, 2 negative
+    needed = {1}
+    needed.update(2 for t in types if t != "3ph")
+    needed.update(0 for t in types if t in ("LG", "LLG"))
+    providers = [circuit.zbus_zero_provider if 0 in needed else None,
+                 circuit.zbus_pos_provider,
+                 circuit.zbus_neg_provider if 2 in needed else None]
+    if any(providers[s] is None for s in needed):
+        raise ValueError("A sequence Ybus needed for these faults is singular.")
+
+    n_faults = len(types) * len(buses)
+    current_seq = np.zeros((n_faults, 3), dtype=complex)
+    voltage_seq = np.zeros((n_faults, len(monitored), 3), dtype=complex)
+    if branch_currents:
+        n_branches = len(circuit.line_table) + len(circuit.transformer_table)
+        from_seq = np.zeros((n_faults, n_branches, 3), dtype=complex)
+        to_seq = np.zeros_like(from_seq)
+
+    for start in range(0, len(buses), block_size):
+        block = fault_idx[start:start + block_size]
+
+        # Zbus[monitored, fault bus] and Zbus[fault bus, fault bus] per sequence, (monitored x block) and (block,)
+        z_mon = [None, None, None]
+        z_nn = [np.zeros(len(block), dtype=complex) for _ in range(3)]
+        for s, provider in enumerate(providers):
+            if provider is None:
+                continue
+            cols = provider.columns(block)
+            z_mon[s] = cols[mon_idx, :]
+            z_nn[s] = cols[block, np.arange(len(block))]
+
+        for t, fault_type in enumerate(types):
+            I0, I1, I2 = sequence_currents(fault_type, z_nn[1], z_nn[2], z_nn[0], zf, v_prefault[block])
+            rows = slice(t * len(buses) + start, t * len(buses) + start + len(block))
+            current_seq[rows] = np.column_stack((I0, I1, I2))
+
+            # V1 = Vpre - Z1 I1, V2 = -Z2 I2, V0 = -Z0 I0, (block x monitored)
+            voltage_seq[rows, :, 1] = v_prefault[mon_idx][np.newaxis, :] - (z_mon[1] * I1).T
+            if z_mon[2] is not None:
+                voltage_seq[rows, :, 2] = -(z_mon[2] * I2).T
+            if z_mon[0] is not None:
+                voltage_seq[rows, :, 0] = -(z_mon[0] * I0).T
+
+            if branch_currents:
+                from_seq[rows], to_seq[rows] = branch_fault_currents(circuit, voltage_seq[rows])
+
+    result = {
+        "fault_bus": [bus for _ in types for bus in buses],
+        "fault_type": [fault_type for fault_type in types for _ in buses],
+        "buses": monitored,
+        "current_seq": current_seq,  # (faults x 3) I0, I1, I2
+        "current": current_seq @ A.T,  # (faults x 3) Ia, Ib, Ic
+        "voltage_seq": voltage_seq,  # (faults x buses x 3) V0, V1, V2
+        "voltage": voltage_seq @ A.T,  # (faults x buses x 3) Va, Vb, Vc
+    }
+    if branch_currents:
+        result.update({
+            "branches": circuit.branch_names,
+            "branch_current_from_seq": from_seq,  # (faults x branches x 3) I0, I1, I2 entering at bus1
+            "branch_current_from": from_seq @ A.T,  # (faults x branches x 3) Ia, Ib, Ic entering at bus1
+            "branch_current_to_seq": to_seq,  # (faults x branches x 3) entering at bus2
+            "branch_current_to": to_seq @ A.T,
+        })
+
+    return result
+
+
+def line_fault_sweep(circuit, line_name, positions, zf=0, types=fault_types, v_prefault=1.0, monitored=None):
+    # faults at fractions p of the way from bus1 to bus2 of a line, for every position, fault impedance and type
+    # the faulted point is a fictitious bus f splitting the series impedance z into p z and (1 - p) z:
+    #   Z_ff = (1-p)^2 Z_ii + p^2 Z_jj + 2 p (1-p) Z_ij + p (1-p) z,   Z_kf = (1-p) Z_ki + p Z_kj
+    # so only the Zbus columns of the two terminals are needed (line charging is left at the terminals)
+
+    if line_name not in circuit.transmissionlines:
+        raise ValueError(f"Transmission Line '{line_name}' not found.")
+    if not circuit.transmissionlines[line_name].in_service:
+        raise ValueError(f"Transmission Line '{line_name}' is out of service.")
+    for fault_type in types:
+        if fault_type not in fault_types:
+            raise ValueError(f"Invalid fault type: {fault_type}")
+
+    positions = np.atleast_1d(np.asarray(positions, dtype=float))
+    if np.any((positions < 0) | (positions > 1)):
+        raise ValueError("Fault positions must lie between 0 (bus1) and 1 (bus2).")
+    zf = np.atleast_1d(np.asarray(zf, dtype=complex))
+
+    line = circuit.transmissionlines[line_name]
+    i, j = circuit.bus_index[line.bus1.name], circuit.bus_index[line.bus2.name]
+    names = list(circuit.buses.keys())
+    monitored = names if monitored is None else list(monitored)
+    mon_idx = np.array([circuit.bus_index[bus] for bus in monitored], dtype=np.int64)
+
+    v_prefault = np.broadcast_to(np.asarray(v_prefault, dtype=complex), (len(names),))
+    p = positions[:, np.newaxis]  # (positions x 1)
+    v_f = (1 - p[:, 0]) * v_prefault[i] + p[:, 0] * v_prefault[j]  # prefault voltage at the faulted point
+
+    providers = [circuit.zbus_zero_provider, circuit.zbus_pos_provider, circuit.zbus_neg_provider]
+    z_series = [1 / line.table.get(f"y{s}", line.row) for s in (0, 1, 2)]
+
+    z_ff = []  # per sequence, (positions,)
+    z_mf = []  # per sequence, (positions x monitored)
+    for provider, z in zip(providers, z_series):
+        if provider is None:
+            z_ff.append(None)
+            z_mf.append(None)
+            continue
+        cols = provider.columns([i, j])
+        z_ff.append((1 - p[:, 0])**2 * cols[i, 0] + p[:, 0]**2 * cols[j, 1] + 2 * p[:, 0] * (1 - p[:, 0]) * cols[i, 1]
+                    + p[:, 0] * (1 - p[:, 0]) * z)
+        z_mf.append((1 - p) * cols[mon_idx, 0] + p * cols[mon_idx, 1])
+
+    needed = {1}
+    needed.update(2 for t in types if t != "3ph")
+    needed.update(0 for t in types if t in ("LG", "LLG"))
+    if any(z_ff[s] is None for s in needed):
+        raise ValueError("A sequence Ybus needed for these faults is singular.")
+    zeros = np.zeros(len(positions), dtype=complex)
+    z_ff = [zeros if z is None else z for z in z_ff]
+
+    # (types x positions x zf x ...) with positions along axis 1 and fault impedances along axis 2
+    shape = (len(types), len(positions), len(zf))
+    current_seq = np.zeros(shape + (3,), dtype=complex)
+    voltage_seq = np.zeros(shape + (len(monitored), 3), dtype=complex)
+
+    for t, fault_type in enumerate(types):
+        I0, I1, I2 = sequence_currents(fault_type, z_ff[1][:, np.newaxis], z_ff[2][:, np.newaxis], z_ff[0][:, np.newaxis],
+                                       zf[np.newaxis, :], v_f[:, np.newaxis])
+        current_seq[t] = np.stack(np.broadcast_arrays(I0, I1, I2), axis=-1)
+
+        voltage_seq[t, ..., 1] = v_prefault[mon_idx] - z_mf[1][:, np.newaxis, :] * I1[..., np.newaxis]
+        if z_mf[2] is not None:
+            voltage_seq[t, ..., 2] = -z_mf[2][:, np.newaxis, :] * I2[..., np.newaxis]
+        if z_mf[0] is not None:
+            voltage_seq[t, ..., 0] = -z_mf[0][:, np.newaxis, :] * I0[..., np.newaxis]
+
+    return {
+        "line": line_name,
+        "types": list(types),
+        "positions": positions,
+        "zf": zf,
+        "buses": monitored,
+        "z_thevenin": np.array(z_ff),  # (3 x positions) Z0, Z1, Z2 at the faulted point
+        "current_seq": current_seq,  # (types x positions x zf x 3) I0, I1, I2
+        "current": current_seq @ A.T,  # (types x positions x zf x 3) Ia, Ib, Ic
+        "voltage_seq": voltage_seq,  # (types x positions x zf x buses x 3) V0, V1, V2
+        "voltage": voltage_seq @ A.T,  # (types x positions x zf x buses x 3) Va, Vb, Vc
+    }
@@ -0,0 +1,59 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+from Bus import Bus
+from SystemSettings import SystemSettings
+from DeviceTable import DeviceTable
+import numpy as np
+import pandas as pd
+
+class Shunt:
+
+    # one record per shunt in the circuit shunt table
+    table_dtype = [("bus", np.int64), ("g", np.float64), ("b", np.float64), ("y", np.complex128)]
+
+    def __init__(self, name: str, bus: Bus, g: float, b: float, table: DeviceTable = None, row: int = None):
+        # fixed admittance to ground, g MW consumed and b Mvar injected (capacitive) at 1 p.u. voltage
+        self.name = name
+        self.bus = bus
+
+        # a row already written by Circuit.add_shunts
+        if row is not None:
+            self.table = table
+            self.row = row
+            return
+
+        # the shunt is stored as a row of the circuit shunt table
+        self.table = table if table is not None else DeviceTable(Shunt.table_dtype, capacity=1)
+        self.row = self.table.append(bus=-1 if bus.index is None else bus.index, g=g, b=b,
+                                     y=complex(g, b) / SystemSettings.Sbase)
+
+    @property
+    def g(self):
+        return float(self.table.get("g", self.row)) #MW
+
+    @property
+    def b(self):
+        return float(self.table.get("b", self.row)) #MVAR
+
+    @property
+    def y_pu(self):
+        return complex(self.table.get("y", self.row)) # in per unit
+
+    def y_prim(self):
+        Y = self.y_pu
+
+        Yprim = pd.DataFrame([[Y]], index=[self.bus.name], columns=[self.bus.name])
+
+        return Yprim
+
+
+if __name__ == "__main__":
+    Bus9 = Bus("Bus9", 230)
+
+    # 19 Mvar capacitor bank
+    shunt1 = Shunt("SH9", Bus9, 0, 19)
+
+    print(shunt1.name, shunt1.bus.name, shunt1.g, shunt1.b)
+    print(shunt1.y_prim())
@@ -2,6 +2,9 @@ import numpy as np
 import pandas as pd
 from Circuit import Circuit
 from SystemSettings import SystemSettings
+from Jacobian import Jacobian
+from SparseLU import DenseFactor
+from ShortCircuit import fault_types, short_circuit_sweep, line_fault_sweep
 import matplotlib.pyplot as plt
 
 
@@ -9,14 +12,53 @@ class Solution:
 
     def __init__(self, circuit: Circuit):
         self.circuit = circuit
-        self.ybus = circuit.calc_ybus() # Ybus from Circuit
+        self.bus_index = circuit.freeze_topology()  # bus name -> position in every array below
         self.voltages, self.angles = self.get_voltages()  # voltage & angles in p.u. and radians
-        self.zbus_pos = circuit.zbus_pos
-        self.zbus_neg = circuit.zbus_neg
-        self.zbus_zero = circuit.zbus_zero
+        self.jacobian = Jacobian(self)  # rebuilt from the current voltages on every iteration
+        self.jacobian_factor = None  # ((circuit version, status version), factors) kept for Jacobian reuse across solves
+        self.solve_stats = {}  # iterations and factorizations of the last solve
+        self.converged_state = None  # (voltages, angles) of the last converged power flow, used as a warm start
         self.voltage_profile = {}  # Track voltage over iterations
         self.tracked_bus = None  # Specify which bus to track
 
+    # network matrices come from the Circuit, which rebuilds them only after a change
+
+    @property
+    def ybus(self):
+        return self.circuit.ybus
+
+    @property
+    def zbus_pos_provider(self):
+        return self.circuit.zbus_pos_provider
+
+    @property
+    def zbus_neg_provider(self):
+        return self.circuit.zbus_neg_provider
+
+    @property
+    def zbus_zero_provider(self):
+        return self.circuit.zbus_zero_provider
+
+    @property
+    def zbus_pos(self):
+        return self.circuit.zbus_pos
+
+    @property
+    def zbus_neg(self):
+        return self.circuit.zbus_neg
+
+    @property
+    def zbus_zero(self):
+        return self.circuit.zbus_zero
+
+    @property
+    def pv_pq_idx(self):
+        return self.circuit.pv_pq_idx
+
+    @property
+    def pq_idx(self):
+        return self.circuit.pq_idx
+
     def set_tracked_bus(self, bus_name):
         if bus_name not in self.circuit.buses:
             raise ValueError(f"Bus '{bus_name}' not found in the circuit.")
@@ -26,7 +68,7 @@ class Solution:
     def track_voltage(self, label):
         if self.tracked_bus is not None:
             # Store a copy of the current value to avoid referencing the same object
-            self.voltage_profile[self.tracked_bus].append((label, float(self.voltages[self.tracked_bus])))
+            self.voltage_profile[self.tracked_bus].append((label, float(self.voltages[self.bus_index[self.tracked_bus]])))
 
     def plot_voltage_profile(self, tracked_bus=None):
         if tracked_bus is None:
@@ -52,131 +94,285 @@ class Solution:
         plt.show()
 
     def get_voltages(self):
-        voltages = {}
-        angles = {}
-
-        for bus_name, bus in self.circuit.buses.items():
-            voltages[bus_name] = bus.vpu  # start with 1.0 per-unit
-            angles[bus_name] = bus.delta  # assume flat start
+        voltages = np.array([bus.vpu for bus in self.circuit.buses.values()], dtype=float)  # start with 1.0 per-unit
+        angles = np.array([bus.delta for bus in self.circuit.buses.values()], dtype=float)  # assume flat start
 
         return voltages, angles
 
-    def compute_power_injection(self):
-        num_buses = len(self.circuit.buses)  # total number of buses
-        P = np.zeros(num_buses)  # array for real power injections
-        Q = np.zeros(num_buses)  # array for reactive power injections
-
-        bus_list = list(self.circuit.buses.keys())  # ordered list of bus names
-
-        for i, bus_name in enumerate(bus_list):  # iterate through each bus
-            vk = self.voltages[bus_name]  # voltage magnitude at bus k
-            delta_k = self.angles[bus_name]  # voltage angle at bus k
-            ybus_row = self.circuit.ybus.loc[bus_name]  # get Ybus row for bus k
-
-            pk, qk = 0, 0  # initialize power injections to be 0
-
-            for bus_j, ykj in ybus_row.items():  # iterate through connected buses
-                if bus_j in self.voltages:
-                    vj = self.voltages[bus_j]  # voltage magnitude at bus j
-                    delta_j = self.angles[bus_j]  # voltage angle at bus j
-                    theta_kj = np.angle(ykj)  # phase angle of Ybus element
-
-                    # compute power injections
-                    pk += vk * vj * abs(ykj) * np.cos(delta_k - delta_j - theta_kj)
-                    qk += vk * vj * abs(ykj) * np.sin(delta_k - delta_j - theta_kj)
+    def initialize(self, init="auto"):
+        # initial guess for the power flow
+        # "flat": bus.vpu and bus.delta, "dc": flat magnitudes with DC power flow angles,
+        # "previous": last converged state, "auto": previous if there is one, flat otherwise,
+        # or a (voltages, angles) pair of arrays ordered by bus index
+        if isinstance(init, str):
+            if init == "auto":
+                init = "previous" if self.converged_state is not None else "flat"
+
+            if init == "flat":
+                self.voltages, self.angles = self.get_voltages()
+            elif init == "dc":
+                self.voltages, self.angles = self.get_voltages()
+                self.angles = self.angles + self.dc_power_flow()[0]
+            elif init == "previous":
+                if self.converged_state is None:
+                    raise ValueError("No converged power flow to start from.")
+                self.voltages, self.angles = self.converged_state[0].copy(), self.converged_state[1].copy()
+            else:
+                raise ValueError(f"Invalid initialization: {init}")
+        else:
+            voltages, angles = init
+            voltages = np.array(voltages, dtype=float)
+            angles = np.array(angles, dtype=float)
+            if voltages.shape != (len(self.circuit.buses),) or angles.shape != voltages.shape:
+                raise ValueError("Initial voltages and angles need one entry per bus.")
+            self.voltages, self.angles = voltages, angles
 
-            P[i] = pk  # store computed real power injection
-            Q[i] = qk  # store computed reactive power injection
+    def compute_power_injection(self):
+        # complex power injection S = V * conj(Ybus V) with one sparse matvec
+        V = self.voltages * np.exp(1j * self.angles)
+        S = V * np.conj(self.circuit.ybus_sparse.matrix @ V)
 
-        return P, Q
+        return S.real, S.imag
 
     def compute_power_mismatch(self):
         P_calc, Q_calc = self.compute_power_injection()
-        bus_list = list(self.circuit.buses.keys())
-
-        # create mappings from bus name to index
-        bus_index = {name: idx for idx, name in enumerate(bus_list)}
+        p_specified, q_specified = self.circuit.power_specified
 
-        # first compute ΔP for all non-slack buses
-        delta_p = []
-        for bus_name in bus_list:
-            bus = self.circuit.buses[bus_name]
-            if bus.bus_type == "Slack Bus":
-                continue
+        # ΔP for all non-slack buses, then ΔQ for only PQ buses
+        delta_p = p_specified[self.pv_pq_idx] - P_calc[self.pv_pq_idx]
+        delta_q = q_specified[self.pq_idx] - Q_calc[self.pq_idx]
 
-            p_specified = 0
-            for gen in self.circuit.generators.values():
-                if gen.bus.name == bus_name:
-                    p_specified += gen.mw_setpoint / SystemSettings.Sbase
+        # return full mismatch vector
+        return np.concatenate((delta_p, delta_q))
+
+    def factorize_jacobian(self, solver="sparse"):
+        # factors of the Jacobian at the present voltages
+        J = self.jacobian.calc_jacobian()
+
+        if solver == "sparse":
+            return self.circuit.jacobian_lu.factorize(J)
+        return DenseFactor(J.toarray())
+
+    def apply_step(self, delta_x):
+        # adds a Newton correction [Δδ of the non-slack buses, ΔV of the PQ buses] to the state
+        npv_pq = len(self.pv_pq_idx)
+        self.angles[self.pv_pq_idx] += delta_x[:npv_pq]
+        self.voltages[self.pq_idx] += delta_x[npv_pq:]
+
+    def calc_step_size(self, delta_x, mismatches, step_control, min_step=1 / 64):
+        # multiplier for delta_x, "iwamoto" uses the optimal multiplier and "backtracking" halves the
+        # step until the mismatch norm goes down
+        angles, voltages = self.angles.copy(), self.voltages.copy()
+
+        def mismatch_at(mu):
+            self.angles[:], self.voltages[:] = angles, voltages
+            self.apply_step(mu * delta_x)
+            return self.compute_power_mismatch()
+
+        try:
+            if step_control == "iwamoto":
+                # mismatch(x + mu dx) ~ a + mu b + mu^2 c, pick the mu that minimizes its norm
+                a = mismatches
+                b = -mismatches
+                c = mismatch_at(1.0)
+                roots = np.roots([2 * (c @ c), 3 * (b @ c), b @ b + 2 * (a @ c), a @ b])
+                candidates = [m.real for m in roots if abs(m.imag) < 1e-9 and 0 < m.real <= 2]
+                mu = min(candidates, key=lambda m: np.linalg.norm(a + m * b + m ** 2 * c)) if candidates else 1.0
+            else:
+                base_norm = np.linalg.norm(mismatches)
+                mu = 1.0
+                while mu > min_step and np.linalg.norm(mismatch_at(mu)) >= (1 - 1e-4 * mu) * base_norm:
+                    mu /= 2
+        finally:
+            self.angles[:], self.voltages[:] = angles, voltages
+
+        return max(mu, min_step)
+
+    def newton_raphson(self, tolerance=0.001, max_iterations=50, solver="sparse", jacobian_reuse=False, refresh_ratio=0.5,
+                       step_control=None, divergence_ratio=100, max_stall=5, verbose=True):
+        # solver="sparse" factorizes J with SuperLU and the circuit's cached ordering, "dense" uses LAPACK
+        # jacobian_reuse=True keeps the factorized Jacobian, also from the previous solve, and only
+        # refactorizes when the mismatch falls by less than refresh_ratio in one iteration
+        # step_control="iwamoto" or "backtracking" scales each step, None takes the full step
+        # the solve stops early once the mismatch grows past divergence_ratio times its best value
+        # or has not improved for max_stall iterations
+        # verbose=False drops the per-iteration printout (batch drivers), the outcome is in solve_stats
+        if solver not in ("sparse", "dense"):
+            raise ValueError(f"Invalid solver: {solver}")
+        if step_control not in (None, "iwamoto", "backtracking"):
+            raise ValueError(f"Invalid step control: {step_control}")
 
-            for load in self.circuit.loads.values():
-                if load.bus.name == bus_name:
-                    p_specified -= load.real_power / SystemSettings.Sbase
+        self.track_voltage("Init")
 
-            i = bus_index[bus_name]
-            delta_p.append(p_specified - P_calc[i])
+        factor = None
+        topology = (self.circuit.version, self.circuit.status_version)  # a factor from before an outage is not reused
+        if jacobian_reuse and self.jacobian_factor is not None and self.jacobian_factor[0] == topology:
+            factor = self.jacobian_factor[1]
+        fresh = False  # True while factor belongs to the present iterate
+        factorizations = 0
+        previous = None  # (max mismatch, angles, voltages) before the last step
+        best_mismatch = np.inf
+        stalled = 0
+
+        def finish(converged, iterations, diverged=False):
+            self.solve_stats = {"method": "nr", "converged": converged, "iterations": iterations,
+                                "factorizations": factorizations, "diverged": diverged}
+            return converged
 
-        # then compute ΔQ for only PQ buses
-        delta_q = []
-        for bus_name in bus_list:
-            bus = self.circuit.buses[bus_name]
-            if bus.bus_type != "PQ Bus":
-                continue
+        for i in range(max_iterations):
+            if verbose:
+                print(f"\nIteration {i + 1}:")
+            mismatches = self.compute_power_mismatch()
+            max_mismatch = np.max(np.abs(mismatches))
+            if verbose:
+                print(f"\nMax mismatch = {max_mismatch:.6f}")
 
-            q_specified = 0
-            for gen in self.circuit.generators.values():
-                if gen.bus.name == bus_name and hasattr(gen, 'mvar_setpoint'):
-                    q_specified += gen.mvar_setpoint / SystemSettings.Sbase
+            # check convergence before paying for a factorization
+            if max_mismatch < tolerance:
+                if verbose:
+                    print("\nConverged!")
+                self.converged_state = (self.voltages.copy(), self.angles.copy())
+                return finish(True, i)
+
+            # a step with a stale (or carried-over) Jacobian is judged first, so it falls back to a full Newton step
+            # instead of counting as divergence
+            if jacobian_reuse and previous is not None and not fresh and not max_mismatch <= refresh_ratio * previous[0]:
+                if not max_mismatch <= previous[0]:
+                    # the step with the old Jacobian made things worse, redo it as a full Newton step
+                    max_mismatch, self.angles[:], self.voltages[:] = previous
+                    mismatches = self.compute_power_mismatch()
+                factor = None
+
+            # give up cheaply on cases that are not going anywhere, only full Newton steps count as no progress
+            if not np.isfinite(max_mismatch) or max_mismatch > divergence_ratio * best_mismatch:
+                if verbose:
+                    print("Mismatch is diverging, stopping early.")
+                return finish(False, i, diverged=True)
+            if max_mismatch < best_mismatch:
+                best_mismatch = max_mismatch
+                stalled = 0
+            elif fresh:
+                stalled += 1
+                if stalled >= max_stall:
+                    if verbose:
+                        print(f"No progress in {max_stall} iterations, stopping early.")
+                    return finish(False, i, diverged=True)
 
-            for load in self.circuit.loads.values():
-                if load.bus.name == bus_name:
-                    q_specified -= load.reactive_power / SystemSettings.Sbase
+            try:
+                if factor is None or not jacobian_reuse:
+                    factor = self.factorize_jacobian(solver)
+                    factorizations += 1
+                    fresh = True
+                else:
+                    fresh = False
+                delta_x = factor.solve(mismatches)
+            except (np.linalg.LinAlgError, RuntimeError):
+                if verbose:
+                    print("The Jacobian is singular, cannot solve")
+                self.jacobian_factor = None
+                return finish(False, i)
+
+            if jacobian_reuse:
+                self.jacobian_factor = (topology, factor)
+            previous = (max_mismatch, self.angles.copy(), self.voltages.copy())
+
+            if step_control is not None:
+                delta_x = self.calc_step_size(delta_x, mismatches, step_control) * delta_x
+
+            self.apply_step(delta_x)
 
-            i = bus_index[bus_name]
-            delta_q.append(q_specified - Q_calc[i])
+            self.track_voltage(f"Iteration {i + 1}")
 
-        # return full mismatch vector
-        return np.array(delta_p + delta_q)
+        if verbose:
+            print("Max iterations reached without convergence.")
+        return finish(False, max_iterations)
+
+    def fast_decoupled(self, tolerance=0.001, max_iterations=50, variant="XB", verbose=True):
+        # fast-decoupled load flow, B' and B'' are factorized once per circuit version and reused
+        # only a solve that (re)builds the factors counts them, the XB B' is shared with the DC power flow
+        if variant not in ("XB", "BX"):
+            raise ValueError(f"Invalid fast-decoupled variant: {variant}")
+
+        factorizations = self.circuit.calc_fdlf_factorizations(variant)
+        try:
+            bprime, bdoubleprime = self.circuit.fdlf_factors(variant)
+        except (ValueError, RuntimeError):
+            # islanded network, B' or B'' cannot be factorized
+            if verbose:
+                print("B' or B'' is singular, cannot solve")
+            self.solve_stats = {"method": "fdlf", "converged": False, "iterations": 0, "factorizations": factorizations}
+            return False
+        p_specified, q_specified = self.circuit.power_specified
+        pv_pq_idx, pq_idx = self.pv_pq_idx, self.pq_idx
 
-    def newton_raphson(self, tolerance=0.001, max_iterations=50):
         self.track_voltage("Init")
 
         for i in range(max_iterations):
-            print(f"\nIteration {i + 1}:")
-            mismatches = self.compute_power_mismatch()
-            max_mismatch = np.max(np.abs(mismatches))
-            print(f"\nMax mismatch = {max_mismatch:.6f}")
-
-            from Jacobian import Jacobian
-            J = Jacobian(self).calc_jacobian()
+            if verbose:
+                print(f"\nIteration {i + 1}:")
 
-            try:
-                delta_x = np.linalg.solve(J, mismatches)
-            except np.linalg.LinAlgError:
-                print("The Jacobian is singular, cannot solve")
-                return False
+            # P half-iteration updates the angles
+            P_calc, Q_calc = self.compute_power_injection()
+            delta_p = p_specified[pv_pq_idx] - P_calc[pv_pq_idx]
+            delta_q = q_specified[pq_idx] - Q_calc[pq_idx]
+            max_mismatch = max(np.max(np.abs(delta_p), initial=0), np.max(np.abs(delta_q), initial=0))
+            if verbose:
+                print(f"\nMax mismatch = {max_mismatch:.6f}")
 
             if max_mismatch < tolerance:
-                print("\nConverged!")
+                if verbose:
+                    print("\nConverged!")
+                self.converged_state = (self.voltages.copy(), self.angles.copy())
+                self.solve_stats = {"method": "fdlf", "converged": True, "iterations": i, "factorizations": factorizations}
                 return True
 
-            idx = 0
-            for bus_name, bus in self.circuit.buses.items():
-                if bus.bus_type != "Slack Bus":
-                    self.angles[bus_name] += delta_x[idx]
-                    idx += 1
-            for bus_name, bus in self.circuit.buses.items():
-                if bus.bus_type == "PQ Bus":
-                    self.voltages[bus_name] += delta_x[idx]
-                    idx += 1
+            self.angles[pv_pq_idx] += bprime.solve(delta_p / self.voltages[pv_pq_idx])
+
+            # Q half-iteration updates the voltage magnitudes
+            _, Q_calc = self.compute_power_injection()
+            delta_q = q_specified[pq_idx] - Q_calc[pq_idx]
+            self.voltages[pq_idx] += bdoubleprime.solve(delta_q / self.voltages[pq_idx])
 
             self.track_voltage(f"Iteration {i + 1}")
 
-        print("Max iterations reached without convergence.")
+        if verbose:
+            print("Max iterations reached without convergence.")
+        self.solve_stats = {"method": "fdlf", "converged": False, "iterations": max_iterations,
+                            "factorizations": factorizations}
         return False
 
-    def power_flow(self, tolerance=0.001, max_iterations=50):
-        return self.newton_raphson(tolerance=tolerance, max_iterations=max_iterations)
+    def dc_power_flow(self, p_injections=None):
+        # lossless DC power flow (|V| = 1, angles only) on the line and transformer reactances
+        # p_injections in MW ordered by bus index, one column per case for a batched solve
+        # returns bus angles in radians and branch flows in MW (see circuit.branch_names)
+
+        if p_injections is None:
+            p_injections = self.circuit.power_specified[0] * SystemSettings.Sbase
+        p_pu = np.asarray(p_injections, dtype=float) / SystemSettings.Sbase
+
+        _, bf = self.circuit.dc_matrices
+        angles = np.zeros(p_pu.shape)
+        angles[self.pv_pq_idx] = self.circuit.dc_factor.solve(p_pu[self.pv_pq_idx])  # the slack stays at 0 rad
+
+        flows = (bf @ angles) * SystemSettings.Sbase
+
+        return angles, flows
+
+    def power_flow(self, tolerance=0.001, max_iterations=50, solver="sparse", method="nr", jacobian_reuse=False, refresh_ratio=0.5,
+                   step_control=None, init="auto", variant="XB", verbose=True):
+        # method="nr" runs Newton-Raphson, method="fdlf" the fast-decoupled load flow (variant "XB" or "BX")
+        # init picks the starting point, see initialize(); by default a second call starts from the last solution
+        if method not in ("nr", "fdlf"):
+            raise ValueError(f"Invalid power flow method: {method}")
+
+        self.initialize(init)
+
+        if method == "fdlf":
+            return self.fast_decoupled(tolerance=tolerance, max_iterations=max_iterations, variant=variant, verbose=verbose)
+
+        return self.newton_raphson(tolerance=tolerance, max_iterations=max_iterations, solver=solver,
+                                   jacobian_reuse=jacobian_reuse, refresh_ratio=refresh_ratio, step_control=step_control,
+                                   verbose=verbose)
 
     def sequence_to_phase(self, V0, V1, V2):
         a = np.exp(1j * 2 * np.pi / 3)
@@ -188,23 +384,27 @@ class Solution:
         V_seq = np.array([V0, V1, V2])
         return A @ V_seq  # returns [Va, Vb, Vc]
 
+    def branch_flows(self):
+        # P/Q at both ends, losses and percent loading of every line and transformer at the present voltages
+        # column arrays ordered as circuit.branch_names
+        return self.circuit.calc_branch_flows(self.voltages * np.exp(1j * self.angles))
+
+    def short_circuit_sweep(self, buses=None, types=fault_types, zf=0, v_prefault=1.0, monitored=None, branch_currents=False):
+        # non-interactive fault study, every fault type at every bus in buses (all buses if None)
+        # returns fault currents (faults x phases) and post-fault voltages (faults x buses x phases), see ShortCircuit.py
+        # branch_currents=True adds the currents of every line and transformer (faults x branches x phases)
+        return short_circuit_sweep(self.circuit, buses=buses, types=types, zf=zf, v_prefault=v_prefault, monitored=monitored,
+                                   branch_currents=branch_currents)
+
+    def line_fault_sweep(self, line, positions, zf=0, types=fault_types, v_prefault=1.0, monitored=None):
+        # faults along a transmission line at fractions positions of its length (0 at bus1), for every zf and type
+        # arrays are shaped (types x positions x zf x ...), no refactorization is needed
+        return line_fault_sweep(self.circuit, line, positions, zf=zf, types=types, v_prefault=v_prefault, monitored=monitored)
+
     def fault_study(self):
         print("\nFAULT ANALYSIS")
         print("=" * 60)
 
-        # Ensure latest Ybus and Zbus matrices are calculated
-        self.circuit.ybus = self.circuit.calc_ybus()
-        self.circuit.ybus_pos = self.circuit.calc_ybus_pos_sequence()
-        self.circuit.ybus_neg = self.circuit.calc_ybus_neg_sequence()
-        self.circuit.ybus_zero = self.circuit.calc_ybus_zero_sequence()
-        self.circuit.zbus_pos, self.circuit.zbus_neg, self.circuit.zbus_zero = self.circuit.calc_sequence_zbuses()
-
-        # Update the references in the Solution object
-        self.ybus = self.circuit.ybus
-        self.zbus_pos = self.circuit.zbus_pos
-        self.zbus_neg = self.circuit.zbus_neg
-        self.zbus_zero = self.circuit.zbus_zero
-
         self.track_voltage("Before Fault")
 
         print("Select fault type:")
@@ -237,50 +437,60 @@ class Solution:
 
     def perform_symmetrical_fault(self, bus, v_prefault):
         print("\n>>> Performing symmetrical 3-phase fault analysis")
-        Znn = self.zbus_pos.loc[bus, bus]
+        n = self.bus_index[bus]  # column of the faulted bus
+        z1_col = self.zbus_pos_provider.column(n)
+        Znn = z1_col[n]
         If = v_prefault / Znn
         print(f"\nSubtransient fault current at {bus}: {abs(If):.4f} p.u. ∠{np.angle(If, deg=True):.2f}°")
 
-        for k in self.zbus_pos.index:
-            Zkn = self.zbus_pos.loc[k, bus]
+        for k, bus_k in enumerate(self.circuit.buses):
+            Zkn = z1_col[k]
             V1_k = v_prefault - Zkn * If
             V0_k = 0
             V2_k = 0
             Va, _, _ = self.sequence_to_phase(V0_k, V1_k, V2_k)
-            print(f"Post-fault Phase A voltage at {k}: {abs(Va):.4f} p.u. ∠{np.angle(Va, deg=True):.2f}°")
-            if self.tracked_bus == k:
-                self.voltages[self.tracked_bus] = abs(Va)
+            print(f"Post-fault Phase A voltage at {bus_k}: {abs(Va):.4f} p.u. ∠{np.angle(Va, deg=True):.2f}°")
+            if self.tracked_bus == bus_k:
+                self.voltages[k] = abs(Va)
 
         self.track_voltage("After Fault")
 
     def perform_lg_fault(self, bus, v_prefault, Zf):
         print("\n>>> Performing line‑to‑ground (LG) fault analysis")
-        Z1_nn = self.zbus_pos.loc[bus, bus]
-        Z2_nn = self.zbus_neg.loc[bus, bus]
-        Z0_nn = self.zbus_zero.loc[bus, bus]
+        n = self.bus_index[bus]  # column of the faulted bus
+        z1_col = self.zbus_pos_provider.column(n)
+        z2_col = self.zbus_neg_provider.column(n)
+        z0_col = self.zbus_zero_provider.column(n)
+        Z1_nn = z1_col[n]
+        Z2_nn = z2_col[n]
+        Z0_nn = z0_col[n]
         Z_total = Z1_nn + Z2_nn + Z0_nn + 3 * Zf
         I1 = I2 = I0 = v_prefault / Z_total
         Ia, _, _ = self.sequence_to_phase(I0, I1, I2)
         print(f"Phase A fault current: {abs(Ia):.4f} p.u. ∠{np.angle(Ia, deg=True):.2f}°")
 
-        for k in self.circuit.buses:
-            Z1_kn = self.zbus_pos.loc[k, bus]
-            Z2_kn = self.zbus_neg.loc[k, bus]
-            Z0_kn = self.zbus_zero.loc[k, bus]
+        for k, bus_k in enumerate(self.circuit.buses):
+            Z1_kn = z1_col[k]
+            Z2_kn = z2_col[k]
+            Z0_kn = z0_col[k]
             V1_k = v_prefault - Z1_kn * I1
             V2_k = -Z2_kn * I2
             V0_k = -Z0_kn * I0
             Va, _, _ = self.sequence_to_phase(V0_k, V1_k, V2_k)
-            print(f"Post-fault Phase A voltage at {k}: {abs(Va):.4f} p.u. ∠{np.angle(Va, deg=True):.2f}°")
-            if self.tracked_bus == k:
-                self.voltages[self.tracked_bus] = abs(Va)
+            print(f"Post-fault Phase A voltage at {bus_k}: {abs(Va):.4f} p.u. ∠{np.angle(Va, deg=True):.2f}°")
+            if self.tracked_bus == bus_k:
+                self.voltages[k] = abs(Va)
 
         self.track_voltage("After Fault")
 
     def perform_ll_fault(self, bus, v_prefault, Zf):
         print("\n>>> Performing line‑to‑line fault analysis")
-        Z1_nn = self.zbus_pos.loc[bus, bus]
-        Z2_nn = self.zbus_neg.loc[bus, bus]
+        n = self.bus_index[bus]  # column of the faulted bus
+        z1_col = self.zbus_pos_provider.column(n)
+        z2_col = self.zbus_neg_provider.column(n)
+        z0_col = self.zbus_zero_provider.column(n)
+        Z1_nn = z1_col[n]
+        Z2_nn = z2_col[n]
         Z_total = Z1_nn + Z2_nn + Zf
         I1 = v_prefault / Z_total
         I2 = -I1
@@ -288,25 +498,29 @@ class Solution:
         Iab = np.sqrt(3) * I1
         print(f"Line current between A and B (Iab): {abs(Iab):.4f} p.u. ∠{np.angle(Iab, deg=True):.2f}°")
 
-        for k in self.circuit.buses:
-            Z1_kn = self.zbus_pos.loc[k, bus]
-            Z2_kn = self.zbus_neg.loc[k, bus]
-            Z0_kn = self.zbus_zero.loc[k, bus]
+        for k, bus_k in enumerate(self.circuit.buses):
+            Z1_kn = z1_col[k]
+            Z2_kn = z2_col[k]
+            Z0_kn = z0_col[k]
             V1_k = v_prefault - Z1_kn * I1
             V2_k = -Z2_kn * I2
             V0_k = 0
             Va, _, _ = self.sequence_to_phase(V0_k, V1_k, V2_k)
-            print(f"Post-fault Phase A voltage at {k}: {abs(Va):.4f} p.u. ∠{np.angle(Va, deg=True):.2f}°")
-            if self.tracked_bus == k:
-                self.voltages[self.tracked_bus] = abs(Va)
+            print(f"Post-fault Phase A voltage at {bus_k}: {abs(Va):.4f} p.u. ∠{np.angle(Va, deg=True):.2f}°")
+            if self.tracked_bus == bus_k:
+                self.voltages[k] = abs(Va)
 
         self.track_voltage("After Fault")
 
     def perform_llg_fault(self, bus, v_prefault, Zf):
         print("\n>>> Performing double line-to-ground (LLG) fault analysis")
-        Z1_nn = self.zbus_pos.loc[bus, bus]
-        Z2_nn = self.zbus_neg.loc[bus, bus]
-        Z0_nn = self.zbus_zero.loc[bus, bus]
+        n = self.bus_index[bus]  # column of the faulted bus
+        z1_col = self.zbus_pos_provider.column(n)
+        z2_col = self.zbus_neg_provider.column(n)
+        z0_col = self.zbus_zero_provider.column(n)
+        Z1_nn = z1_col[n]
+        Z2_nn = z2_col[n]
+        Z0_nn = z0_col[n]
         Z_total1 = Z1_nn + (Z2_nn * (Z0_nn + 3 * Zf)) / (Z2_nn + Z0_nn + 3 * Zf)
         I1 = v_prefault / Z_total1
         I2 = -I1 * (Z0_nn + 3 * Zf) / (Z2_nn + Z0_nn + 3 * Zf)
@@ -314,17 +528,17 @@ class Solution:
         Iab = np.sqrt(3) * I1
         print(f"Line current between A and B (Iab): {abs(Iab):.4f} p.u ∠{np.angle(Iab, deg=True):.2f}°")
 
-        for k in self.circuit.buses:
-            Z1_kn = self.zbus_pos.loc[k, bus]
-            Z2_kn = self.zbus_neg.loc[k, bus]
-            Z0_kn = self.zbus_zero.loc[k, bus]
+        for k, bus_k in enumerate(self.circuit.buses):
+            Z1_kn = z1_col[k]
+            Z2_kn = z2_col[k]
+            Z0_kn = z0_col[k]
             V1_k = v_prefault - Z1_kn * I1
             V2_k = -Z2_kn * I2
             V0_k = -Z0_kn * I0
             Va, _, _ = self.sequence_to_phase(V0_k, V1_k, V2_k)
-            print(f"Post-fault Phase A voltage at {k}: {abs(Va):.4f} p.u ∠{np.angle(Va, deg=True):.2f}°")
-            if self.tracked_bus == k:
-                self.voltages[self.tracked_bus] = abs(Va)
+            print(f"Post-fault Phase A voltage at {bus_k}: {abs(Va):.4f} p.u ∠{np.angle(Va, deg=True):.2f}°")
+            if self.tracked_bus == bus_k:
+                self.voltages[k] = abs(Va)
 
         self.track_voltage("After Fault")
 
@@ -377,4 +591,8 @@ if __name__ == "__main__":
 
     solution.power_flow()
 
+    sweep = solution.short_circuit_sweep()
+    for bus, fault_type, current in zip(sweep["fault_bus"], sweep["fault_type"], sweep["current"]):
+        print(f"{fault_type:<4} fault at {bus}: |Ia| = {abs(current[0]):.4f} p.u.")
+
     solution.fault_study()
@@ -0,0 +1,167 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+import scipy.linalg as la
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+
+class SparseLU:
+
+    # "amd" and "rcm" permute rows and columns alike (the Jacobian is structurally symmetric),
+    # "colamd" only permutes columns, "natural" keeps the matrix as it is
+    orderings = ("amd", "colamd", "rcm", "natural")
+
+    def __init__(self, ordering: str = "amd", pivot_threshold: float = 0.1):
+        if ordering not in SparseLU.orderings:
+            raise ValueError(f"Invalid ordering: {ordering}")
+
+        self.ordering = ordering
+        self.pivot_threshold = pivot_threshold  # prefer diagonal pivots, keeps the fill of the ordering
+        self.perm = None  # fill-reducing ordering, computed on the first factorization only
+        self.factorizations = 0
+
+    @property
+    def symmetric(self):
+        return self.ordering != "colamd"
+
+    def calc_ordering(self, matrix):
+        # ordering for the sparsity pattern of matrix, reused for every later matrix with the same pattern
+        # "amd" and "colamd" come out of a SuperLU factorization of matrix, that factor is returned as well (None otherwise)
+
+        if self.ordering == "amd":
+            # minimum degree on A^T + A, SuperLU returns it as the inverse permutation
+            factor = spla.splu(matrix, permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=self.pivot_threshold,
+                               options=dict(SymmetricMode=True))
+            return np.argsort(factor.perm_c), factor
+        if self.ordering == "colamd":
+            factor = spla.splu(matrix, permc_spec="COLAMD")
+            return np.argsort(factor.perm_c), factor
+        if self.ordering == "rcm":
+            pattern = abs(matrix) + abs(matrix.T)  # symmetric pattern of A + A^T
+            return reverse_cuthill_mckee(sp.csr_matrix(pattern), symmetric_mode=True).astype(np.int64), None
+
+        return np.arange(matrix.shape[0]), None
+
+    def factorize(self, matrix):
+        # LU factors of matrix with the stored ordering, only the numeric factorization is redone
+
+        matrix = sp.csc_matrix(matrix)
+        if self.perm is None or len(self.perm) != matrix.shape[0]:
+            self.perm, factor = self.calc_ordering(matrix)
+            if factor is not None:
+                # the factorization that produced the ordering already solves A x = b with SuperLU's own permutations
+                self.factorizations += 1
+                identity = np.arange(matrix.shape[0])
+                return SparseFactor(factor, identity, identity)
+
+        if self.symmetric:
+            row_perm = self.perm
+            factor = spla.splu(matrix[self.perm][:, self.perm], permc_spec="NATURAL",
+                               diag_pivot_thresh=self.pivot_threshold, options=dict(SymmetricMode=True))
+        else:
+            row_perm = np.arange(matrix.shape[0])
+            factor = spla.splu(matrix[:, self.perm], permc_spec="NATURAL")
+        self.factorizations += 1
+
+        return SparseFactor(factor, row_perm, self.perm)
+
+
+class SparseFactor:
+
+    def __init__(self, factor, row_perm, col_perm):
+        self.factor = factor  # SuperLU factors of A[row_perm][:, col_perm]
+        self.row_perm = row_perm
+        self.col_perm = col_perm
+
+    @property
+    def shape(self):
+        return self.factor.shape
+
+    def solve(self, rhs):
+        # x with A x = rhs, rhs may hold one right-hand side per column
+        y = self.factor.solve(np.asarray(rhs)[self.row_perm])
+        x = np.empty_like(y)
+        x[self.col_perm] = y
+        return x
+
+
+class UpdatedFactor:
+
+    # solves with matrix = base_matrix + D through the factors of base_matrix (Sherman-Morrison-Woodbury),
+    # D only touches a few rows and columns, e.g. the terminals of switched branches
+    #   x = A^-1 b - A^-1 U C (I + U^T A^-1 U C)^-1 U^T A^-1 b,  U = the unit columns of those rows, C = D[rows][:, rows]
+
+    def __init__(self, base_factor, base_matrix, matrix):
+        self.base_factor = base_factor
+        self.base_matrix = sp.csr_matrix(base_matrix)
+
+        delta = (sp.csr_matrix(matrix) - self.base_matrix).tocoo()
+        delta.eliminate_zeros()
+        self.idx = np.unique(np.concatenate((delta.row, delta.col)))
+        self.C = delta.toarray()[np.ix_(self.idx, self.idx)]
+
+        self.AinvU = None
+        self.K = None
+        if len(self.idx):
+            unit = np.zeros((self.shape[0], len(self.idx)), dtype=np.result_type(self.C, float))
+            unit[self.idx, np.arange(len(self.idx))] = 1
+            self.AinvU = base_factor.solve(unit)
+            capacitance = np.eye(len(self.idx)) + self.AinvU[self.idx] @ self.C
+            if np.linalg.cond(capacitance) > 1e12:  # the updated matrix is singular, e.g. an islanded bus
+                raise np.linalg.LinAlgError("Singular matrix")
+            self.K = self.C @ np.linalg.inv(capacitance)
+
+    @property
+    def shape(self):
+        return self.base_factor.shape
+
+    @property
+    def rank(self):
+        return len(self.idx)
+
+    def solve(self, rhs):
+        x = self.base_factor.solve(rhs)
+        if self.K is None:
+            return x
+        return x - self.AinvU @ (self.K @ x[self.idx])
+
+
+class DenseFactor:
+
+    def __init__(self, matrix):
+        self.lu, self.piv = la.lu_factor(np.asarray(matrix))
+        if np.any(np.diag(self.lu) == 0):
+            raise np.linalg.LinAlgError("Singular matrix")
+
+    @property
+    def shape(self):
+        return self.lu.shape
+
+    def solve(self, rhs):
+        return la.lu_solve((self.lu, self.piv), np.asarray(rhs))
+
+
+if __name__ == "__main__":
+    A = sp.csr_matrix(np.array([[4.0, -1.0, 0.0, -1.0],
+                                [-1.0, 4.0, -1.0, 0.0],
+                                [0.0, -1.0, 4.0, -1.0],
+                                [-1.0, 0.0, -1.0, 4.0]]))
+    b = np.array([1.0, 2.0, 3.0, 4.0])
+
+    for ordering in SparseLU.orderings:
+        lu = SparseLU(ordering)
+        x = lu.factorize(A).solve(b)
+        x2 = lu.factorize(2 * A).solve(b)  # same pattern, ordering reused
+        print(ordering, lu.perm, np.allclose(A @ x, b), np.allclose(2 * A @ x2, b))
+
+    print("dense", np.allclose(A @ DenseFactor(A.toarray()).solve(b), b))
+
+    # drop the coupling between the first two rows without refactorizing
+    A2 = A.tolil()
+    A2[0, 0], A2[1, 1], A2[0, 1], A2[1, 0] = 3.0, 3.0, 0.0, 0.0
+    updated = UpdatedFactor(SparseLU().factorize(A), A, A2.tocsr())
+    print("updated", updated.rank, np.allclose(A2 @ updated.solve(b), b))
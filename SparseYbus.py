@@ -0,0 +1,77 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+
+class SparseYbus:
+
+    def __init__(self, matrix, bus_names):
+        self.matrix = sp.csr_matrix(matrix)  # row-compressed for matvecs
+        self.bus_names = list(bus_names)
+        self._csc = None  # column-compressed copy, only built for factorizations
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    @property
+    def nnz(self):
+        return self.matrix.nnz
+
+    def tocsc(self):
+        if self._csc is None:
+            self._csc = self.matrix.tocsc()
+        return self._csc
+
+    def add(self, rows, cols, values):
+        # adds values to existing entries in place, the sparsity pattern (and any ordering built on it) is kept
+        matrix = self.matrix
+        for row, col, value in zip(rows, cols, values):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            pos = np.flatnonzero(matrix.indices[start:end] == col)
+            if len(pos) == 0:
+                raise ValueError(f"Entry ({row}, {col}) is not in the Ybus pattern.")
+            matrix.data[start + pos[0]] += value
+        self._csc = None
+
+    def to_dataframe(self):
+        # dense labeled view, only for printing and small cases
+        return pd.DataFrame(self.matrix.toarray(), index=self.bus_names, columns=self.bus_names)
+
+
+def assemble_ybus(bus_names, rows, cols, values):
+    # sums every (row, col, value) triplet into one sparse matrix, duplicates are added together
+
+    N = len(bus_names)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    values = np.asarray(values, dtype=complex)
+
+    matrix = sp.coo_matrix((values, (rows, cols)), shape=(N, N)).tocsr()
+    matrix.sum_duplicates()
+
+    return SparseYbus(matrix, bus_names)
+
+
+def branch_triplets(from_idx, to_idx, y_ff, y_ft, y_tf, y_tt):
+    # expands the 2x2 primitive of every branch into four triplets at once
+
+    rows = np.concatenate((from_idx, to_idx, from_idx, to_idx))
+    cols = np.concatenate((from_idx, to_idx, to_idx, from_idx))
+    values = np.concatenate((y_ff, y_tt, y_ft, y_tf))
+    return rows, cols, values
+
+
+if __name__ == "__main__":
+    # two buses joined by a single series admittance
+    rows, cols, values = branch_triplets(np.array([0]), np.array([1]),
+                                         np.array([2 - 5j]), np.array([-2 + 5j]),
+                                         np.array([-2 + 5j]), np.array([2 - 5j]))
+    ybus = assemble_ybus(["Bus1", "Bus2"], rows, cols, values)
+
+    print(ybus.matrix)
+    print(ybus.to_dataframe())
@@ -0,0 +1,140 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+import os
+import numpy as np
+
+from Circuit import Circuit
+from ExampleCircuit import build_example_circuit
+from Solution import Solution
+from SystemSettings import SystemSettings
+
+
+class TimeSeries:
+
+    def __init__(self, circuit: Circuit, load_profiles=None, generator_profiles=None, tolerance: float = 0.001,
+                 max_iterations: int = 20, method: str = "nr", solver: str = "sparse", variant: str = "XB"):
+        # load_profiles: load name -> MW per timestep (Q follows at the load's base power factor)
+        #                or an array of shape (timesteps, 2) holding MW and Mvar
+        # generator_profiles: generator name -> MW setpoint per timestep
+        self.circuit = circuit
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.method = method
+        self.solver = solver
+        self.variant = variant  # fast-decoupled variant, used with method="fdlf"
+
+        load_profiles = load_profiles or {}
+        generator_profiles = generator_profiles or {}
+        for name in load_profiles:
+            if name not in circuit.loads:
+                raise ValueError(f"Load '{name}' not found.")
+        for name in generator_profiles:
+            if name not in circuit.generators:
+                raise ValueError(f"Generator '{name}' not found.")
+
+        lengths = {len(profile) for profile in list(load_profiles.values()) + list(generator_profiles.values())}
+        if len(lengths) > 1:
+            raise ValueError("All profiles need the same number of timesteps.")
+        self.timesteps = lengths.pop() if lengths else 0
+
+        # profiles as (timesteps x devices) arrays so every timestep is one contiguous row
+        self.load_rows = np.array([circuit.loads[name].row for name in load_profiles], dtype=np.int64)
+        self.generator_rows = np.array([circuit.generators[name].row for name in generator_profiles], dtype=np.int64)
+
+        self.load_p = np.zeros((self.timesteps, len(self.load_rows)))
+        self.load_q = np.zeros((self.timesteps, len(self.load_rows)))
+        for j, (name, profile) in enumerate(load_profiles.items()):
+            profile = np.asarray(profile, dtype=float)
+            if profile.ndim == 2:
+                self.load_p[:, j], self.load_q[:, j] = profile[:, 0], profile[:, 1]
+            else:
+                load = circuit.loads[name]
+                ratio = load.reactive_power / load.real_power if load.real_power != 0 else 0
+                self.load_p[:, j] = profile
+                self.load_q[:, j] = profile * ratio if load.real_power != 0 else load.reactive_power
+
+        self.generator_p = np.zeros((self.timesteps, len(self.generator_rows)))
+        for j, profile in enumerate(generator_profiles.values()):
+            self.generator_p[:, j] = np.asarray(profile, dtype=float)
+
+        self.results = None
+
+    def allocate(self, output=None):
+        # result arrays, in memory or as .npy files in the output directory that are written as the run goes
+        T, N = self.timesteps, len(self.circuit.buses)
+        fields = {"voltages": (np.float64, (T, N)), "angles": (np.float64, (T, N)),
+                  "converged": (np.bool_, (T,)), "iterations": (np.int32, (T,))}
+
+        if output is None:
+            return {name: np.zeros(shape, dtype=dtype) for name, (dtype, shape) in fields.items()}
+
+        os.makedirs(output, exist_ok=True)
+        return {name: np.lib.format.open_memmap(os.path.join(output, f"{name}.npy"), mode="w+", dtype=dtype, shape=shape)
+                for name, (dtype, shape) in fields.items()}
+
+    def run(self, output=None, flush_every: int = 96, verbose: bool = False):
+        # solves every timestep on one Solution, warm-started from the previous converged step
+        # the network matrices and factors stay cached because only the load and generator tables change
+        # output is a directory for on-disk results (flushed every flush_every steps), None keeps them in memory
+
+        circuit = self.circuit
+        solution = Solution(circuit)
+        results = self.allocate(output)
+
+        loads = circuit.load_table
+        gens = circuit.generator_table
+        base_p = loads.data["real_power"][self.load_rows].copy()
+        base_q = loads.data["reactive_power"][self.load_rows].copy()
+        base_y = loads.data["y"][self.load_rows].copy()
+        base_mw = gens.data["mw_setpoint"][self.generator_rows].copy()
+
+        try:
+            for t in range(self.timesteps):
+                loads.set_rows("real_power", self.load_rows, self.load_p[t])
+                loads.set_rows("reactive_power", self.load_rows, self.load_q[t])
+                # same constant-admittance model as Load.update_admittance, for the sequence networks
+                loads.set_rows("y", self.load_rows, (self.load_p[t] - 1j * self.load_q[t]) / SystemSettings.Sbase)
+                gens.set_rows("mw_setpoint", self.generator_rows, self.generator_p[t])
+
+                converged = solution.power_flow(tolerance=self.tolerance, max_iterations=self.max_iterations,
+                                                solver=self.solver, method=self.method, variant=self.variant,
+                                                init="auto", verbose=verbose)
+
+                results["voltages"][t] = solution.voltages
+                results["angles"][t] = solution.angles
+                results["converged"][t] = converged
+                results["iterations"][t] = solution.solve_stats.get("iterations", 0)
+
+                if output is not None and (t + 1) % flush_every == 0:
+                    for array in results.values():
+                        array.flush()
+        finally:
+            # leave the circuit at its base-case loading
+            loads.set_rows("real_power", self.load_rows, base_p)
+            loads.set_rows("reactive_power", self.load_rows, base_q)
+            loads.set_rows("y", self.load_rows, base_y)
+            gens.set_rows("mw_setpoint", self.generator_rows, base_mw)
+            if output is not None:
+                for array in results.values():
+                    array.flush()
+
+        self.results = results
+        return results
+
+
+if __name__ == "__main__":
+    circuit1 = build_example_circuit()
+
+    # one day in hourly steps, loads follow a daily curve and G2 tracks part of it
+    hours = np.arange(24)
+    shape = 0.75 + 0.25 * np.sin((hours - 8) * np.pi / 12)
+    series = TimeSeries(circuit1,
+                        load_profiles={"L1": 110 * shape, "L2": 100 * shape, "L3": 100 * shape},
+                        generator_profiles={"G2": 150 + 50 * shape})
+    results = series.run()
+
+    for t in hours:
+        print(f"Hour {t:>2}: Vmin = {results['voltages'][t].min():.4f} p.u., "
+              f"iterations = {results['iterations'][t]}, converged = {results['converged'][t]}")
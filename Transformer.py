@@ -6,11 +6,23 @@ import numpy as np
 import pandas as pd
 from Bus import Bus
 from SystemSettings import SystemSettings
+from DeviceTable import DeviceTable
 
 class Transformer:
 
+    # winding connection codes stored in the transformer table
+    connection_codes = {"Y-Y": 0, "Y-DELTA": 1, "DELTA-Y": 2, "DELTA-DELTA": 3}
+
+    # one record per transformer in the circuit transformer table
+    table_dtype = [("bus1", np.int64), ("bus2", np.int64), ("connection", np.int8),
+                   ("power_rating", np.float64), ("r", np.float64), ("x", np.float64),
+                   ("y", np.complex128),
+                   ("y0_11", np.complex128), ("y0_12", np.complex128), ("y0_22", np.complex128),
+                   ("tap", np.float64), ("b", np.float64), ("in_service", np.bool_)]
+
     def __init__(self, name: str, bus1: Bus, bus2: Bus, power_rating: float,
-                 impedance_percent: float, x_over_r_ratio: float, connection_type: str, grounding_impedance: float):
+                 impedance_percent: float, x_over_r_ratio: float, connection_type: str, grounding_impedance: float,
+                 table: DeviceTable = None, row: int = None):
         self.name = name
         self.bus1 = bus1
         self.bus2 = bus2
@@ -20,16 +32,81 @@ class Transformer:
 
         self.connection_type = connection_type.upper()
         self.Zn = grounding_impedance  # in ohms - NEED TO MAKE IN PU
+        # None: ungrounded neutral, e.g. an imported transformer without winding data
+
+        if self.connection_type not in Transformer.connection_codes:
+            raise ValueError(f"Invalid connection type: {self.connection_type}")
 
+        # a row already written by Circuit.add_transformers_impedance, only the zero-sequence entries are left
+        if row is not None:
+            self.table = table
+            self.row = row
+            y0_11, y0_12, y0_22 = self.calc_zero_sequence_entries()
+            self.table.set("y0_11", self.row, y0_11)
+            self.table.set("y0_12", self.row, y0_12)
+            self.table.set("y0_22", self.row, y0_22)
+            return
 
         # impedance and admittance values
-        self.Rpusys, self.Xpusys = self.calc_impedance()
-        self.Yseries = self.calc_admittance()
-
-        # sequence admittances
-        self.yprim = self.calc_yprim()
-        self.yprim_neg = self.calc_yprim_negative()
-        self.yprim_zero = self.calc_yprim_zero()
+        Rpusys, Xpusys = self.calc_impedance()
+
+        # the transformer is stored as a row of the circuit transformer table
+        self.table = table if table is not None else DeviceTable(Transformer.table_dtype, capacity=1)
+        self.row = self.table.append(
+            bus1=-1 if bus1.index is None else bus1.index,
+            bus2=-1 if bus2.index is None else bus2.index,
+            connection=Transformer.connection_codes[self.connection_type],
+            power_rating=power_rating, r=Rpusys, x=Xpusys, tap=1.0, b=0.0, in_service=True)
+        self.table.set("y", self.row, self.calc_admittance())
+
+        # zero-sequence primitive entries
+        y0_11, y0_12, y0_22 = self.calc_zero_sequence_entries()
+        self.table.set("y0_11", self.row, y0_11)
+        self.table.set("y0_12", self.row, y0_12)
+        self.table.set("y0_22", self.row, y0_22)
+
+    # impedance and admittance values are read from the table row
+
+    @property
+    def in_service(self):
+        # switched through Circuit.outage / Circuit.restore
+        return bool(self.table.get("in_service", self.row))
+
+    @property
+    def tap(self):
+        # off-nominal turns ratio at bus1, 1 unless imported
+        return float(self.table.get("tap", self.row))
+
+    @property
+    def b(self):
+        # total charging susceptance in per unit, half at each end, 0 unless imported
+        return float(self.table.get("b", self.row))
+
+    @property
+    def Rpusys(self):
+        return float(self.table.get("r", self.row))
+
+    @property
+    def Xpusys(self):
+        return float(self.table.get("x", self.row))
+
+    @property
+    def Yseries(self):
+        return complex(self.table.get("y", self.row))
+
+    # sequence admittances, only built when asked for
+
+    @property
+    def yprim(self):
+        return self.calc_yprim()
+
+    @property
+    def yprim_neg(self):
+        return self.calc_yprim_negative()
+
+    @property
+    def yprim_zero(self):
+        return self.calc_yprim_zero()
 
     def calc_impedance(self):
 
@@ -46,9 +123,11 @@ class Transformer:
 
     def calc_yprim(self):
 
+        # off-nominal tap at bus1, charging split between the two ends
+        ysh = 1j * self.b / 2
         yprim = np.array([
-            [self.Yseries, -self.Yseries],
-            [-self.Yseries, self.Yseries]
+            [(self.Yseries + ysh) / self.tap ** 2, -self.Yseries / self.tap],
+            [-self.Yseries / self.tap, self.Yseries + ysh]
         ])
         yprim_df = pd.DataFrame(yprim, index=[self.bus1.name, self.bus2.name], columns=[self.bus1.name, self.bus2.name])
 
@@ -57,20 +136,32 @@ class Transformer:
     def calc_yprim_negative(self):
         # equal to positive sequence
 
+        ysh = 1j * self.b / 2
         yprim_2 = np.array([
-            [self.Yseries, -self.Yseries],
-            [-self.Yseries, self.Yseries]
+            [(self.Yseries + ysh) / self.tap ** 2, -self.Yseries / self.tap],
+            [-self.Yseries / self.tap, self.Yseries + ysh]
         ])
         yprim_neg = pd.DataFrame(yprim_2, index=[self.bus1.name, self.bus2.name], columns=[self.bus1.name, self.bus2.name])
 
         return yprim_neg
 
-    def calc_yprim_zero(self):
+    def calc_zero_sequence_entries(self):
+        # diagonal and off-diagonal entries of the zero-sequence primitive
         y = self.Yseries
 
+        # no zero-sequence current without a grounded neutral
+        if self.Zn is None:
+            return 0, 0, 0
+
+        # solidly grounded neutral: the zero-sequence current only sees the leakage impedance
+        if self.Zn == 0:
+            y11, y12, y22 = {"Y-Y": (y, -y, y), "Y-DELTA": (y, 0, 0), "DELTA-Y": (0, 0, y),
+                             "DELTA-DELTA": (0, 0, 0)}[self.connection_type]
+            return y11, -y12, y22
+
         # convert grounding impedance (ohms to pu)
-        zbase =  (SystemSettings.Sbase / self.power_rating) * (self.impedance_percent / 100 ) * np.exp(1j * np.arctan(self.x_over_r_ratio))
-        zn_pu = self.Zn / zbase if self.Zn != 0 else 1e-6
+        zbase = complex(self.Rpusys, self.Xpusys)
+        zn_pu = self.Zn / zbase
 
 
         if self.connection_type == "Y-Y":
@@ -91,7 +182,14 @@ class Transformer:
         else:
             raise ValueError(f"Invalid connection type: {self.connection_type}")
 
-        yprim_zero = pd.DataFrame([[y11, -y12], [-y12, y22]],
+        return y11, -y12, y22
+
+    def calc_yprim_zero(self):
+        y11 = self.table.get("y0_11", self.row)
+        y12 = self.table.get("y0_12", self.row)
+        y22 = self.table.get("y0_22", self.row)
+
+        yprim_zero = pd.DataFrame([[y11, y12], [y12, y22]],
                                   index=[self.bus1.name, self.bus2.name],
                                   columns=[self.bus1.name, self.bus2.name])
         return yprim_zero
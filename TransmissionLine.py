@@ -10,10 +10,21 @@ from Bundle import Bundle
 from Geometry import Geometry
 from Bus import Bus
 from SystemSettings import SystemSettings
+from DeviceTable import DeviceTable
 
 class TransmissionLine:
 
-    def __init__(self, name: str, bus1: Bus, bus2: Bus, bundle: Bundle, geometry: Geometry, length: float):
+    # one record per line in the circuit line table
+    table_dtype = [("bus1", np.int64), ("bus2", np.int64),
+                   ("r1", np.float64), ("x1", np.float64), ("b1", np.float64),
+                   ("r2", np.float64), ("x2", np.float64), ("b2", np.float64),
+                   ("r0", np.float64), ("x0", np.float64), ("b0", np.float64),
+                   ("y1", np.complex128), ("y2", np.complex128), ("y0", np.complex128),
+                   ("ysh1", np.complex128), ("ysh2", np.complex128), ("ysh0", np.complex128),
+                   ("ampacity", np.float64), ("in_service", np.bool_)]
+
+    def __init__(self, name: str, bus1: Bus, bus2: Bus, bundle: Bundle, geometry: Geometry, length: float,
+                 table: DeviceTable = None, row: int = None):
         self.name = name
         self.bus1 = bus1
         self.bus2 = bus2
@@ -23,25 +34,93 @@ class TransmissionLine:
 
         self.zbase, self.ybase = self.calc_base_values()
 
+        # a row already written by Circuit.add_tlines_impedance, R/X/B given directly without bundle and geometry
+        if row is not None:
+            self.table = table
+            self.row = row
+            return
+
         # positive-sequence parameters
-        self.Rpu = self.calc_Rpu()
-        self.Xpu = self.calc_Xpu()
-        self.Bpu = self.calc_Bpu()
-
-        # Negative-sequence (same as pos)
-        self.R2pu = self.Rpu
-        self.X2pu = self.Xpu
-        self.B2pu = self.Bpu
-
-        # zero-sequence (overhead approximation: 2.5 pos for X and R and same B)
-        self.R0pu = 2.5 * self.Rpu
-        self.X0pu = 2.5 * self.Xpu
-        self.B0pu = self.Bpu
-
-        # admittance matrices
-        self.yprim = self.calc_yprim()
-        self.yprim_neg = self.calc_yprim_negative_sequence()
-        self.yprim_zero = self.calc_yprim_zero_sequence()
+        Rpu = self.calc_Rpu()
+        Xpu = self.calc_Xpu()
+        Bpu = self.calc_Bpu()
+
+        # the line is stored as a row of the circuit line table, standalone lines get their own table
+        self.table = table if table is not None else DeviceTable(TransmissionLine.table_dtype, capacity=1)
+        self.row = self.table.append(
+            bus1=-1 if bus1.index is None else bus1.index,
+            bus2=-1 if bus2.index is None else bus2.index,
+            # negative-sequence (same as pos)
+            r1=Rpu, x1=Xpu, b1=Bpu, r2=Rpu, x2=Xpu, b2=Bpu,
+            # zero-sequence (overhead approximation: 2.5 pos for X and R and same B)
+            r0=2.5 * Rpu, x0=2.5 * Xpu, b0=Bpu,
+            # series and shunt admittances per sequence
+            y1=1 / complex(Rpu, Xpu), y2=1 / complex(Rpu, Xpu), y0=1 / complex(2.5 * Rpu, 2.5 * Xpu),
+            ysh1=complex(0, Bpu), ysh2=complex(0, Bpu), ysh0=complex(0, Bpu),
+            # current rating of the whole bundle [A]
+            ampacity=bundle.conductor.ampacity * bundle.num_conductors,
+            in_service=True)
+
+    # sequence parameters are read from the table row
+
+    @property
+    def Rpu(self):
+        return float(self.table.get("r1", self.row))
+
+    @property
+    def Xpu(self):
+        return float(self.table.get("x1", self.row))
+
+    @property
+    def Bpu(self):
+        return float(self.table.get("b1", self.row))
+
+    @property
+    def R2pu(self):
+        return float(self.table.get("r2", self.row))
+
+    @property
+    def X2pu(self):
+        return float(self.table.get("x2", self.row))
+
+    @property
+    def B2pu(self):
+        return float(self.table.get("b2", self.row))
+
+    @property
+    def R0pu(self):
+        return float(self.table.get("r0", self.row))
+
+    @property
+    def X0pu(self):
+        return float(self.table.get("x0", self.row))
+
+    @property
+    def B0pu(self):
+        return float(self.table.get("b0", self.row))
+
+    @property
+    def ampacity(self):
+        return float(self.table.get("ampacity", self.row))
+
+    @property
+    def in_service(self):
+        # switched through Circuit.outage / Circuit.restore
+        return bool(self.table.get("in_service", self.row))
+
+    # admittance matrices, only built when asked for
+
+    @property
+    def yprim(self):
+        return self.calc_yprim()
+
+    @property
+    def yprim_neg(self):
+        return self.calc_yprim_negative_sequence()
+
+    @property
+    def yprim_zero(self):
+        return self.calc_yprim_zero_sequence()
 
     def calc_base_values(self):
 
@@ -0,0 +1,123 @@
+# Project 3
+# ECE 2774
+# Maria Hermann
+
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from SparseLU import SparseLU, UpdatedFactor
+
+
+class ZbusProvider:
+
+    # Zbus = Ybus^-1 read through sparse LU factors of Ybus, one column is one forward/back substitution
+    # so the dense inverse is never formed
+
+    def __init__(self, ybus, cache_size: int = 64):
+        # ybus is a SparseYbus, cache_size is the number of solved columns kept (least recently used are dropped)
+        self.bus_names = list(ybus.bus_names)
+        self.bus_index = {name: i for i, name in enumerate(self.bus_names)}
+        self.factor = SparseLU().factorize(ybus.tocsc())  # RuntimeError if the Ybus is singular
+        self.base_factor = self.factor
+        self.base_matrix = ybus.matrix.copy()  # the matrix that was factorized, low-rank updates are taken against it
+        self.cache_size = cache_size
+        self._columns = OrderedDict()
+        self.solves = 0  # columns solved so far, cache hits excluded
+
+    @property
+    def shape(self):
+        return self.factor.shape
+
+    def index(self, bus):
+        # accepts a bus name or a bus index
+        if isinstance(bus, str):
+            return self.bus_index[bus]
+        return int(bus)
+
+    def columns(self, buses):
+        # Zbus[:, buses] as an N x len(buses) array, every column not in the cache is solved in one pass
+        idx = [self.index(bus) for bus in buses]
+        missing = list(dict.fromkeys(k for k in idx if k not in self._columns))
+
+        solved = {}
+        if missing:
+            rhs = np.zeros((self.shape[0], len(missing)), dtype=complex)
+            rhs[missing, np.arange(len(missing))] = 1
+            block = self.factor.solve(rhs)
+            self.solves += len(missing)
+            solved = {k: block[:, j] for j, k in enumerate(missing)}
+
+        result = np.empty((self.shape[0], len(idx)), dtype=complex)
+        for j, k in enumerate(idx):
+            if k in solved:
+                result[:, j] = solved[k]
+                self._store(k, solved[k])
+            else:
+                result[:, j] = self._columns[k]
+                self._columns.move_to_end(k)
+
+        return result
+
+    def column(self, bus):
+        return self.columns([bus])[:, 0]
+
+    def element(self, row, col):
+        # Zbus is symmetric, so a cached row column serves as well
+        i, j = self.index(row), self.index(col)
+        if i in self._columns and j not in self._columns:
+            return self.column(i)[j]
+        return self.column(j)[i]
+
+    def diagonal(self, buses=None):
+        # driving point impedances of the given buses (all buses if None)
+        if buses is None:
+            buses = range(self.shape[0])
+        idx = [self.index(bus) for bus in buses]
+        if not idx:
+            return np.zeros(0, dtype=complex)
+        return self.columns(idx)[idx, np.arange(len(idx))]
+
+    def submatrix(self, rows, cols):
+        rows = [self.index(bus) for bus in rows]
+        return self.columns(cols)[rows, :]
+
+    def to_dataframe(self):
+        # full dense Zbus, only for printing and small cases
+        return pd.DataFrame(self.columns(range(self.shape[0])), index=self.bus_names, columns=self.bus_names)
+
+    def update(self, ybus):
+        # Ybus changed in a few rows and columns (switched branches), keep the factors and correct every solve instead
+        # raises LinAlgError if the change leaves the Ybus singular
+        self.factor = UpdatedFactor(self.base_factor, self.base_matrix, ybus.matrix)
+        if self.factor.rank == 0:
+            self.factor = self.base_factor
+        self.clear()
+
+    def clear(self):
+        self._columns.clear()
+
+    def _store(self, k, column):
+        self._columns[k] = column
+        self._columns.move_to_end(k)
+        while len(self._columns) > self.cache_size:
+            self._columns.popitem(last=False)
+
+
+if __name__ == "__main__":
+    from SparseYbus import assemble_ybus
+
+    # three buses in a ring with a shunt at every bus
+    rows = [0, 1, 2, 0, 1, 1, 2, 2, 0]
+    cols = [0, 1, 2, 1, 0, 2, 1, 0, 2]
+    values = [3 - 10j, 3 - 10j, 3 - 10j, -1 + 5j, -1 + 5j, -1 + 5j, -1 + 5j, -1 + 5j, -1 + 5j]
+    ybus = assemble_ybus(["Bus1", "Bus2", "Bus3"], rows, cols, values)
+
+    zbus = ZbusProvider(ybus, cache_size=2)
+    dense = np.linalg.inv(ybus.matrix.toarray())
+
+    print(np.allclose(zbus.column("Bus2"), dense[:, 1]))
+    print(np.allclose(zbus.diagonal(), np.diag(dense)))
+    print(np.isclose(zbus.element("Bus1", "Bus3"), dense[0, 2]))
+    print(np.allclose(zbus.submatrix([0, 2], ["Bus2", "Bus3"]), dense[np.ix_([0, 2], [1, 2])]))
+    print(len(zbus._columns), zbus.solves)